@@ -1,10 +1,16 @@
 # core/meta_master.py
 
 import os
+import re
 import importlib
 import time
 import traceback
 
+from utils.module_scan import scan_py_modules
+
+# Skompilowane wzorce nazw silników do klonowania (tylko całe identyfikatory)
+_IDENT_CACHE = {}
+
 class MetaMaster:
     def __init__(self, core_path='core', engines_path='engines', sensors_path='sensors', data_path='data', hive_enabled=True):
         self.core_path = core_path
@@ -18,28 +24,53 @@ class MetaMaster:
         self.success_streak = 0
         self.meta_mood = "curious"
         self.max_hunger = 10  # po ilu cyklach głód wymusza ewolucję
-
-        self.load_all_modules()
+        self._load_cache = {}  # folder -> (nazwy modułów ze skanu, załadowane moduły)
+        self._profit_cache = None  # (mtime_ns profit.log, ostatni profit)
+        self._engine_scores = {}  # nazwa silnika -> skumulowany wynik z feedbacku
+        self._active_engine = None  # silnik, któremu przypisujemy bieżący profit (ostatni klon)
+        self._credited_mtime = None  # mtime_ns profit.log już zaliczonego do _engine_scores
+
+        # Silniki i sensory ładowane leniwie – przy pierwszym użyciu
+        self._engines = None
+        self._sensors = None
+
+    @property
+    def engines(self):
+        self._ensure_loaded()
+        return self._engines
+
+    @property
+    def sensors(self):
+        self._ensure_loaded()
+        return self._sensors
+
+    def _ensure_loaded(self):
+        if self._engines is None or self._sensors is None:
+            self.load_all_modules()
 
     def log(self, msg):
         print(f"[MetaMaster] {msg}")
         self.history.append((time.time(), msg))
 
     def load_all_modules(self):
-        self.engines = self.dynamic_load(self.engines_path)
-        self.sensors = self.dynamic_load(self.sensors_path)
-        self.log(f"Loaded {len(self.engines)} engines and {len(self.sensors)} sensors.")
+        self._engines = self.dynamic_load(self.engines_path)
+        self._sensors = self.dynamic_load(self.sensors_path)
+        self.log(f"Loaded {len(self._engines)} engines and {len(self._sensors)} sensors.")
 
     def dynamic_load(self, folder):
+        names = scan_py_modules(folder, skip_prefix='__')
+        cached = self._load_cache.get(folder)
+        # Ten sam obiekt krotki = katalog się nie zmienił od ostatniego ładowania
+        if cached is not None and cached[0] is names:
+            return dict(cached[1])
         modules = {}
-        for fname in os.listdir(folder):
-            if fname.endswith('.py') and not fname.startswith('__'):
-                mname = fname[:-3]
-                try:
-                    modules[mname] = importlib.import_module(f"{folder}.{mname}")
-                except Exception as e:
-                    self.log(f"Failed to load {folder}.{mname}: {e}")
-        return modules
+        for mname in names:
+            try:
+                modules[mname] = importlib.import_module(f"{folder}.{mname}")
+            except Exception as e:
+                self.log(f"Failed to load {folder}.{mname}: {e}")
+        self._load_cache[folder] = (names, modules)
+        return dict(modules)
 
     def analyze_structure(self):
         # Meta-analityka: wykrywanie braków, dziur, zduplikowanych lub przestarzałych strategii/sensorów
@@ -47,7 +78,7 @@ class MetaMaster:
         for folder in [self.engines_path, self.sensors_path]:
             if not os.path.exists(folder):
                 missing.append(folder)
-            elif len(os.listdir(folder)) == 0:
+            elif not scan_py_modules(folder, skip_prefix='__'):
                 missing.append(f"{folder} is empty")
         if missing:
             self.log(f"Found missing or empty modules: {missing}")
@@ -56,6 +87,7 @@ class MetaMaster:
     def check_performance_and_evolve(self):
         # Analizuje sukcesy/porazki, wyzwala „głód”, klonowanie, ewolucję
         profit = self.get_latest_profit()
+        self._credit_profit(profit)
         if profit < 0:
             self.gie_hunger += 1
             self.success_streak = 0
@@ -74,41 +106,71 @@ class MetaMaster:
     def get_latest_profit(self):
         # Analiza zysków – pobiera z plików/data/ itp. (przykład – do adaptacji pod Twój log profitów)
         profit_log = os.path.join(self.data_path, "profit.log")
-        if os.path.exists(profit_log):
-            with open(profit_log) as f:
-                lines = f.readlines()
-                if lines:
-                    last = lines[-1].strip()
-                    try:
-                        return float(last)
-                    except:
-                        return 0
-        return 0
+        try:
+            mtime = os.stat(profit_log).st_mtime_ns
+        except OSError:
+            return 0
+        # Log się nie zmienił od ostatniego cyklu – zwróć zapamiętany wynik
+        if self._profit_cache is not None and self._profit_cache[0] == mtime:
+            return self._profit_cache[1]
+        # Czytamy tylko końcówkę pliku zamiast całego logu
+        with open(profit_log, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 256))
+            tail = f.read()
+        last = tail.rstrip().rsplit(b"\n", 1)[-1].strip()
+        try:
+            profit = float(last) if last else 0
+        except ValueError:
+            profit = 0
+        self._profit_cache = (mtime, profit)
+        return profit
 
     def evolve_engines_and_sensors(self):
         # Tworzy nowe strategie, klonuje, modyfikuje, integruje nowe sensory, uruchamia hunterów!
         self.log(">> Running meta-evolution: cloning engines, seeking new strategies...")
         # Przykład: klonowanie najlepszego silnika
         if self.engines:
-            best_engine_name = max(self.engines, key=lambda e: self.mock_engine_performance(e))
+            if self._engine_scores:
+                best_engine_name = max(self._engine_scores, key=self._engine_scores.__getitem__)
+            else:
+                best_engine_name = next(iter(self.engines))
             new_engine_name = f"{best_engine_name}_clone_{int(time.time())}"
             self.clone_engine(best_engine_name, new_engine_name)
+            self._active_engine = new_engine_name
             self.log(f"Cloned engine: {best_engine_name} → {new_engine_name}")
         # Przykład: szukanie nowych sensorów
         self.run_hunter_tools()
 
+    def _credit_profit(self, profit):
+        # Każdy nowy wpis profit.log zaliczany raz – aktywnemu silnikowi (domyślnie pierwszemu załadowanemu)
+        if self._profit_cache is None or self._profit_cache[0] == self._credited_mtime:
+            return
+        self._credited_mtime = self._profit_cache[0]
+        engine_name = self._active_engine or next(iter(self.engines), None)
+        if engine_name is not None:
+            self.receive_feedback(engine_name, profit)
+
+    def receive_feedback(self, engine_name, reward):
+        # Wynik silnika aktualizowany przy każdym feedbacku – ewolucja nie przelicza niczego od nowa
+        self._engine_scores[engine_name] = self._engine_scores.get(engine_name, 0.0) + reward
+
     def mock_engine_performance(self, engine_name):
-        # Tu wstaw analizę skuteczności engine (docelowo: realna metryka)
-        return hash(engine_name) % 100
+        # Zapamiętana skuteczność engine (0 dopóki nie było feedbacku)
+        return self._engine_scores.get(engine_name, 0.0)
 
     def clone_engine(self, src, dst):
         src_file = os.path.join(self.engines_path, f"{src}.py")
         dst_file = os.path.join(self.engines_path, f"{dst}.py")
         if os.path.exists(src_file):
-            with open(src_file) as f:
+            pattern = _IDENT_CACHE.get(src)
+            if pattern is None:
+                pattern = _IDENT_CACHE[src] = re.compile(rf"\b{re.escape(src)}\b")
+            with open(src_file, encoding="utf-8") as f:
                 code = f.read()
-            code = code.replace(src, dst)
-            with open(dst_file, "w") as f:
+            code = pattern.sub(dst, code)
+            with open(dst_file, "w", encoding="utf-8", buffering=1 << 16) as f:
                 f.write(code)
         else:
             self.log(f"Cannot clone: {src_file} does not exist.")
@@ -0,0 +1,23 @@
+# core/_meta_reflection_kernels.py
+# Skompilowane (numba) jądra liczbowe MetaReflection – bez numby działają jako zwykły Python
+
+try:
+    from numba import njit as _njit
+except ImportError:
+    def _njit(*args, **kwargs):
+        # Brak numby: dekorator przepuszcza funkcję bez zmian
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+@_njit(cache=True, fastmath=True)
+def _reflect_kernel(results, greed, n):
+    """Liczba sukcesów i suma greed z ostatnich n pozycji tablic równoległych do pamięci zdarzeń."""
+    successes = 0
+    s = 0.0
+    for i in range(results.shape[0] - n, results.shape[0]):
+        if results[i]:
+            successes += 1
+        s += greed[i]
+    return successes, s
@@ -3,12 +3,13 @@ import subprocess
 import os
 import datetime
 import shutil
-from utils.meta_logger import MetaLogger  # Przykład - zalecam taki logger do analizy meta
 # import openai  # jeśli używasz GPT przez API
 
 class AutoEvolver:
     def __init__(self, repo_path="."):
+        from utils.meta_logger import MetaLogger  # leniwie – import modułu nie ciągnie loggera
         self.repo_path = repo_path
+        self._git = ["git", "-C", repo_path]
         self.logger = MetaLogger(log_path=os.path.join(repo_path, "data/auto_evolver.log"))
 
     def evolve(self, prompt):
@@ -28,7 +29,7 @@ class AutoEvolver:
 
         # 1. Tworzenie brancha
         try:
-            subprocess.run(["git", "checkout", "-b", branch_name], cwd=self.repo_path, check=True)
+            self._run_git("checkout", "-b", branch_name)
         except Exception as e:
             self.logger.log(f"ERROR: nie można utworzyć brancha: {e}")
             return False
@@ -49,8 +50,8 @@ class AutoEvolver:
 
         # 3. Commit wygenerowanego kodu
         try:
-            subprocess.run(["git", "add", "."], cwd=self.repo_path, check=True)
-            subprocess.run(["git", "commit", "-m", f"Auto-evolve: {prompt}"], cwd=self.repo_path, check=True)
+            self._run_git("add", ".")
+            self._run_git("commit", "-m", f"Auto-evolve: {prompt}")
         except Exception as e:
             self.logger.log(f"ERROR przy commit: {e}")
             self.rollback(branch_name)
@@ -65,8 +66,8 @@ class AutoEvolver:
 
         # 5. (Opcjonalnie) Merge do main/dev jeśli testy przeszły
         try:
-            subprocess.run(["git", "checkout", "main"], cwd=self.repo_path, check=True)
-            subprocess.run(["git", "merge", branch_name], cwd=self.repo_path, check=True)
+            self._run_git("checkout", "main")
+            self._run_git("merge", branch_name)
             self.logger.log(f"SUCCESS: Zmiany zmergowane do main!")
         except Exception as e:
             self.logger.log(f"ERROR przy merge: {e}")
@@ -75,6 +76,14 @@ class AutoEvolver:
         self.logger.log(f"AUTO-EVOLVE zakończone sukcesem: {branch_name}")
         return True
 
+    def _run_git(self, *args):
+        """Komenda git w repo: stdout odrzucany, stderr przechwycony do logu błędu."""
+        try:
+            subprocess.run([*self._git, *args], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode("utf-8", "replace").strip() if e.stderr else ""
+            raise RuntimeError(f"git {' '.join(args)}: {stderr or e}") from e
+
     def generate_code(self, prompt):
         """
         Podłącz tutaj dowolny LLM lub inny system generujący kod.
@@ -89,7 +98,11 @@ class AutoEvolver:
         Uruchamia testy automatyczne, zwraca True jeśli przeszły
         """
         try:
-            result = subprocess.run(["pytest"], cwd=self.repo_path)
+            # Liczy się tylko kod wyjścia – wyjście pytest nie jest potrzebne
+            result = subprocess.run(
+                ["pytest", "-q", "--no-header"], cwd=self.repo_path,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
             return result.returncode == 0
         except Exception as e:
             self.logger.log(f"ERROR przy testach: {e}")
@@ -100,8 +113,8 @@ class AutoEvolver:
         Usuwa nieudany branch, przywraca main
         """
         try:
-            subprocess.run(["git", "checkout", "main"], cwd=self.repo_path, check=True)
-            subprocess.run(["git", "branch", "-D", branch_name], cwd=self.repo_path, check=True)
+            self._run_git("checkout", "main")
+            self._run_git("branch", "-D", branch_name)
             self.logger.log(f"Rollback wykonany: branch {branch_name} usunięty.")
         except Exception as e:
             self.logger.log(f"ERROR przy rollback: {e}")
@@ -1,21 +1,57 @@
 import os
 import sys
-import importlib
+import importlib.util
+import logging
+from array import array
 import uuid
 import random
-import datetime
+import time
 from typing import Dict, Any, Callable
 
+from utils.lazy_import import lazy_import
+from utils.module_scan import scan_py_modules
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
 # Dynamiczne, odporne na błędy ścieżki (nie używaj .., wszystko lokalnie!)
 PLUGIN_FOLDER = os.path.join(os.path.dirname(__file__), "plugins")
 if not os.path.isdir(PLUGIN_FOLDER):
-    print(f"[ERROR] Folder pluginów nie istnieje: {PLUGIN_FOLDER}")
+    logger.error("Folder pluginów nie istnieje: %s", PLUGIN_FOLDER)
 
 STRATEGY_FOLDER = os.path.join(os.path.dirname(__file__), "engines")
 if not os.path.isdir(STRATEGY_FOLDER):
-    print(f"[ERROR] Folder strategii nie istnieje: {STRATEGY_FOLDER}")
+    logger.error("Folder strategii nie istnieje: %s", STRATEGY_FOLDER)
+
+# Ścieżka -> (mtime_ns, moduł); niezmienione pliki nie są wykonywane ponownie przy kolejnym _discover
+_MODULE_CACHE: Dict[str, tuple] = {}
+
+def _load_from_file(path, mname):
+    """
+    Ładuje moduł bezpośrednio z pliku – bez dopisywania folderu do sys.path. Plik wykonywany
+    tylko gdy jest nowy lub zmieniony; moduł zaimportowany już jako pakiet (core.engines.x) jest reużywany.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _MODULE_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    mod = None
+    if cached is None:
+        pkg_name = f"{__package__}.{os.path.basename(os.path.dirname(path))}.{mname}"
+        mod = sys.modules.get(pkg_name)
+        if mod is not None and os.path.abspath(getattr(mod, "__file__", "") or "") != os.path.abspath(path):
+            mod = None
+    if mod is None:
+        spec = importlib.util.spec_from_file_location(mname, path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+    _MODULE_CACHE[path] = (mtime, mod)
+    return mod
 
 class Plugin:
+    __slots__ = ('engine', 'config')
+
     def __init__(self, engine, config=None):
         self.engine = engine
         self.config = config or {}
@@ -30,6 +66,22 @@ class Plugin:
         pass
 
 class BaseEngine:
+    __slots__ = (
+        'id', 'name', 'symbol', 'lot', 'sensors', 'hive', 'config',
+        'memory_ts', 'memory_reward', 'memory_info', '_reward_sum', 'state',
+        'last_action', 'reward', 'hunger', 'curiosity', 'history', 'clone_count',
+        'plugins', 'loaded_strategies', 'active_strategy', '_rng', '_rand_buf', '_rand_idx'
+    )
+
+    # Rejestry pluginów/strategii współdzielone przez wszystkie silniki i klony
+    _PLUGIN_REGISTRY: Dict[str, type] = {}
+    _STRATEGY_REGISTRY: Dict[str, Callable] = {}
+    _discovered = False
+    _discovered_scan = None
+
+    reflect_window = 10  # ile ostatnich nagród uśrednia meta_reflect
+    rand_batch = 4096    # ile liczb losowych generujemy naraz
+
     def __init__(self, name=None, symbol=None, lot=None, sensors=None, hive=None, config=None, **kwargs):
         self.id = str(uuid.uuid4())
         self.name = name or self.__class__.__name__
@@ -39,7 +91,11 @@ class BaseEngine:
         self.hive = hive
         self.config = config or {}
 
-        self.memory = []
+        # Pamięć feedbacku w układzie SoA: osobna kolumna na pole
+        self.memory_ts = array('q')       # time_ns
+        self.memory_reward = array('d')
+        self.memory_info = []
+        self._reward_sum = 0.0            # suma ostatnich reflect_window nagród
         self.state = {}
         self.last_action = None
         self.reward = 0.0
@@ -52,26 +108,70 @@ class BaseEngine:
         self.loaded_strategies: Dict[str, Callable] = {}
         self.active_strategy: str = None
 
+        self._init_rng()
+
+        BaseEngine._discover()
         self._autoload_plugins()
         self._autoload_strategies()
 
-    # --- Dynamiczne ładowanie pluginów ---
-    def _autoload_plugins(self):
+    # --- Losowość: bufor liczb generowany wsadowo ---
+    def _init_rng(self):
+        self._rng = np.random.default_rng()
+        self._rand_buf = []
+        self._rand_idx = 0
+
+    def _rand(self):
+        """Liczba z [0, 1) z bufora – jedno wywołanie numpy na rand_batch losowań."""
+        if self._rand_idx >= len(self._rand_buf):
+            self._rand_buf = self._rng.random(self.rand_batch).tolist()
+            self._rand_idx = 0
+        x = self._rand_buf[self._rand_idx]
+        self._rand_idx += 1
+        return x
+
+    @classmethod
+    def _discover(cls):
+        """
+        Importuje pluginy i strategie raz na proces; ponownie tylko gdy zmieni się
+        zawartość folderów (nowy plik), więc konstrukcja klona nie dotyka importów.
+        """
         if not os.path.exists(PLUGIN_FOLDER):
             os.makedirs(PLUGIN_FOLDER)
-        sys.path.insert(0, PLUGIN_FOLDER)
-
-        for fname in os.listdir(PLUGIN_FOLDER):
-            if fname.endswith(".py") and not fname.startswith("_"):
-                mname = fname[:-3]
-                try:
-                    mod = importlib.import_module(mname)
-                    if hasattr(mod, "Plugin"):
-                        plugin = mod.Plugin(self)
-                        self.plugins[mname] = plugin
-                        print(f"[BaseEngine] Załadowano plugin: {mname}")
-                except Exception as e:
-                    print(f"[BaseEngine] Błąd ładowania pluginu {mname}: {e}")
+        scan = (scan_py_modules(PLUGIN_FOLDER), scan_py_modules(STRATEGY_FOLDER))
+        if BaseEngine._discovered and BaseEngine._discovered_scan == scan:
+            return
+        plugins = {}
+        for mname in scan[0]:
+            try:
+                mod = _load_from_file(os.path.join(PLUGIN_FOLDER, mname + ".py"), mname)
+                if hasattr(mod, "Plugin"):
+                    plugins[mname] = mod.Plugin
+                    logger.info("[BaseEngine] Załadowano plugin: %s", mname)
+            except Exception as e:
+                logger.error("[BaseEngine] Błąd ładowania pluginu %s: %s", mname, e)
+
+        strategies = {}
+        for mname in scan[1]:
+            try:
+                mod = _load_from_file(os.path.join(STRATEGY_FOLDER, mname + ".py"), mname)
+                if hasattr(mod, "strategy") and callable(mod.strategy):
+                    strategies[mname] = mod.strategy
+                    logger.info("[BaseEngine] Załadowano strategię: %s", mname)
+            except Exception as e:
+                logger.error("[BaseEngine] Błąd ładowania strategii %s: %s", mname, e)
+
+        BaseEngine._PLUGIN_REGISTRY = plugins
+        BaseEngine._STRATEGY_REGISTRY = strategies
+        BaseEngine._discovered_scan = scan
+        BaseEngine._discovered = True
+
+    # --- Dynamiczne ładowanie pluginów ---
+    def _autoload_plugins(self):
+        for mname, plugin_cls in BaseEngine._PLUGIN_REGISTRY.items():
+            try:
+                self.plugins[mname] = plugin_cls(self)
+            except Exception as e:
+                logger.error("[BaseEngine] Błąd ładowania pluginu %s: %s", mname, e)
 
     def use_plugin(self, name, *args, **kwargs):
         plugin = self.plugins.get(name)
@@ -81,23 +181,12 @@ class BaseEngine:
 
     # --- Dynamiczne ładowanie strategii silników ---
     def _autoload_strategies(self):
-        sys.path.insert(0, STRATEGY_FOLDER)
-
-        for fname in os.listdir(STRATEGY_FOLDER):
-            if fname.endswith(".py") and not fname.startswith("_"):
-                mname = fname[:-3]
-                try:
-                    mod = importlib.import_module(mname)
-                    if hasattr(mod, "strategy") and callable(mod.strategy):
-                        self.loaded_strategies[mname] = mod.strategy
-                        print(f"[BaseEngine] Załadowano strategię: {mname}")
-                except Exception as e:
-                    print(f"[BaseEngine] Błąd ładowania strategii {mname}: {e}")
+        self.loaded_strategies.update(BaseEngine._STRATEGY_REGISTRY)
 
     def set_strategy(self, name):
         if name in self.loaded_strategies:
             self.active_strategy = name
-            print(f"[BaseEngine] Aktywowano strategię: {name}")
+            logger.debug("[BaseEngine] Aktywowano strategię: %s", name)
         else:
             raise Exception(f"Strategia {name} nie została załadowana.")
 
@@ -120,7 +209,17 @@ class BaseEngine:
         if self.hive:
             self.hive.share_knowledge(self, reward, info)
         self.reward += reward
-        self.memory.append({'timestamp': datetime.datetime.now(), 'reward': reward, 'info': info})
+        self.memory_ts.append(time.time_ns())
+        self.memory_reward.append(reward)
+        n = len(self.memory_reward)
+        if n > self.reflect_window:
+            self._reward_sum += reward - self.memory_reward[-self.reflect_window - 1]
+        else:
+            self._reward_sum += reward
+        if n % 1024 == 0:
+            # Co jakiś czas dokładne przeliczenie – błąd zaokrągleń się nie kumuluje
+            self._reward_sum = sum(self.memory_reward[-self.reflect_window:])
+        self.memory_info.append(info)
 
     def sense(self, sensors, environment):
         sensor_data = {}
@@ -129,9 +228,10 @@ class BaseEngine:
         return sensor_data
 
     def meta_reflect(self):
-        if len(self.memory) < 3:
+        n = len(self.memory_reward)
+        if n < 3:
             return
-        avg_reward = sum(x['reward'] for x in self.memory[-10:]) / min(10, len(self.memory))
+        avg_reward = self._reward_sum / min(self.reflect_window, n)
         for plugin in self.plugins.values():
             plugin.on_reflect()
         if avg_reward < 0:
@@ -141,7 +241,7 @@ class BaseEngine:
         self.curiosity = min(1, self.curiosity + random.uniform(-0.1, 0.1))
         self.hunger = min(1, self.hunger + random.uniform(-0.1, 0.1))
         self.clone_count += 1
-        print(f"[{self.name}] samodoskonalenie! Klony: {self.clone_count}")
+        logger.debug("[%s] samodoskonalenie! Klony: %d", self.name, self.clone_count)
 
     def _adjust_motivation(self, reward):
         if reward > 0:
@@ -161,7 +261,7 @@ class BaseEngine:
 
     def log_decision(self, decision, environment, reward=None):
         entry = {
-            'timestamp': datetime.datetime.now(),
+            'timestamp': time.time_ns(),
             'decision': decision,
             'env': environment,
             'reward': reward
@@ -173,10 +273,10 @@ class BaseEngine:
             self.hive.broadcast(message, sender=self, recipient=recipient)
 
     def run(self):
-        print("[BaseEngine] Bazowy silnik aktywowany")
+        logger.info("[BaseEngine] Bazowy silnik aktywowany")
 
     def evolve(self):
-        print("[BaseEngine] Ewolucja bazowej strategii")
+        logger.info("[BaseEngine] Ewolucja bazowej strategii")
 
     def evaluate(self, test_data):
         return sum(test_data)  # Przykład: bazowe podejście
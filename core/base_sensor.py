@@ -1,11 +1,122 @@
-import numpy as np
+import atexit
+import math
 import time
 import uuid
 import copy
-import threading
 import json
+import logging
 import os
-from datetime import datetime
+from collections import deque
+
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# =======================
+# LOGI SENSORÓW: jeden otwarty, buforowany uchwyt na plik
+# =======================
+_LOG_HANDLES = {}
+
+def _log_handle(path):
+    fh = _LOG_HANDLES.get(path)
+    if fh is None:
+        log_dir = os.path.dirname(path)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        fh = _LOG_HANDLES[path] = open(path, "ab", buffering=65536)
+    return fh
+
+@atexit.register
+def _close_log_handles():
+    for fh in _LOG_HANDLES.values():
+        try:
+            fh.close()
+        except Exception:
+            pass
+    _LOG_HANDLES.clear()
+
+def _json_default(obj):
+    # Skalary/tablice numpy w fallbacku na stdlib json
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+if orjson is not None:
+    def _dumps(obj):
+        """Wpis logu jako bajty JSON zakończone nową linią."""
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+else:
+    def _dumps(obj):
+        """Wpis logu jako bajty JSON zakończone nową linią."""
+        # Zwarte separatory; ensure_ascii=True trzyma enkoder C na szybkiej ścieżce ASCII
+        return (json.dumps(obj, separators=(",", ":"), default=_json_default) + "\n").encode("ascii")
+
+# =======================
+# STATYSTYKI TICKA
+# =======================
+def _tick_update(k, s, sq, n, x, base_level, lr, hunger, thresh_mul):
+    """
+    Średnia i odchylenie z sum bieżących bufora (O(1)) + adaptacyjny próg i flaga anomalii.
+    s, sq to sumy (x-k) i (x-k)² – przesunięcie o k ≈ średnią chroni wariancję przed
+    utratą precyzji przy dużych wartościach i małym rozrzucie.
+    """
+    d = s / n
+    mean = k + d
+    var = sq / n - d * d
+    if var < 0.0:
+        var = 0.0
+    std = math.sqrt(var)
+    adaptive = base_level + lr * (std + hunger)
+    return mean, std, adaptive, abs(x - mean) > adaptive * thresh_mul
+
+# =======================
+# HISTORIA ODCZYTÓW (SoA)
+# =======================
+class SensorHistory:
+    """
+    Historia odczytów sensora jako bufor cykliczny SoA – osobna tablica numpy
+    na każde pole, więc analizy kroczące działają wektorowo na kolumnach.
+    """
+    __slots__ = ('size', 'ts', 'value', 'mean', 'std', 'anomaly', 'hunger', '_head', '_count')
+
+    def __init__(self, size):
+        self.size = size
+        self.ts = np.zeros(size, dtype=np.int64)
+        self.value = np.zeros(size, dtype=np.float64)
+        self.mean = np.zeros(size, dtype=np.float64)
+        self.std = np.zeros(size, dtype=np.float64)
+        self.anomaly = np.zeros(size, dtype=bool)
+        self.hunger = np.zeros(size, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+    def append(self, ts, value, mean, std, anomaly, hunger):
+        i = self._head
+        self.ts[i] = ts
+        self.value[i] = value
+        self.mean[i] = mean
+        self.std[i] = std
+        self.anomaly[i] = anomaly
+        self.hunger[i] = hunger
+        self._head = (i + 1) % self.size
+        if self._count < self.size:
+            self._count += 1
+
+    def column(self, name, last=None):
+        """Chronologiczna kopia kolumny `name` (opcjonalnie tylko `last` ostatnich wpisów)."""
+        n = self._count if last is None else min(last, self._count)
+        idx = np.arange(self._head - n, self._head) % self.size
+        return getattr(self, name)[idx]
+
+    def __len__(self):
+        return self._count
 
 # =======================
 # SYSTEM HIVE: ROJ INTELIGENCJI
@@ -18,20 +129,56 @@ class Hive:
 
     def add(self, sensor):
         self.members.append(sensor)
-        print(f"[HIVE] Dodano sensor: {sensor.name}")
+        # Nowy członek dostaje wiedzę roju raz; jego własna trafia do delty
+        sensor._kb_delta |= sensor.knowledge_bank - self.knowledge_bank
+        sensor.knowledge_bank |= self.knowledge_bank
+        logger.info("[HIVE] Dodano sensor: %s", sensor.name)
 
     def share_knowledge(self):
-        """Wspólna wymiana wiedzy między wszystkimi sensorami w roju."""
-        for sensor in self.members:
-            sensor.knowledge_bank.update(self.knowledge_bank)
-            self.knowledge_bank.update(sensor.knowledge_bank)
-        print("[HIVE] Knowledge sharing completed.")
+        """
+        Wspólna wymiana wiedzy między wszystkimi sensorami w roju.
+        Propagowane są tylko wzorce nauczone od ostatniej wymiany (delty),
+        więc koszt zależy od liczby nowości, a nie od rozmiaru banku wiedzy.
+        """
+        delta = frozenset().union(*(m._kb_delta for m in self.members))
+        if delta:
+            self.knowledge_bank |= delta
+            for sensor in self.members:
+                sensor.knowledge_bank |= delta
+                sensor._kb_delta.clear()
+                sensor._kb_version += 1
+        logger.debug("[HIVE] Knowledge sharing completed.")
 
     def broadcast(self, msg):
         """Rozsyłanie sygnału do wszystkich sensorów w roju."""
         for sensor in self.members:
             sensor.receive_broadcast(msg)
 
+    def broadcast_tick(self, field, value):
+        """
+        Jeden tick dla wszystkich sensorów roju czytających `field`: bufor, próg adaptacyjny,
+        głód, sygnał rozwoju i historia jak po read(), ale bez składania wyniku-dicta,
+        logu i chmury. Zwraca {sensor.id: anomalia}.
+        """
+        x = float(value)
+        ts = time.time_ns()
+        result = {}
+        for sensor in self.members:
+            if sensor.field != field:
+                continue
+            sensor._push(x)
+            mean, std, adaptive, _ = _tick_update(
+                sensor._shift, sensor._sum, sensor._sumsq, sensor._count, x,
+                sensor.base_level, sensor.learning_rate, sensor.hunger, 2.0
+            )
+            sensor.adaptive_level = adaptive
+            anomaly = bool(sensor._is_anomaly(x, mean, adaptive))
+            sensor.hunger = max(0, sensor.hunger - 1) if anomaly else sensor.hunger + sensor.hunger_step
+            sensor.growth_signal = sensor.hunger > sensor.growth_threshold
+            sensor.history.append(ts, x, mean, std, anomaly, sensor.hunger)
+            result[sensor.id] = anomaly
+        return result
+
 # =======================
 # SYSTEM HUNTER: DYNAMICZNE PODPINANIE ŹRÓDEŁ/NARZĘDZI
 # =======================
@@ -43,28 +190,53 @@ class HunterTools:
 
     def add_tool(self, name, tool_fn):
         self.tools[name] = tool_fn
-        print(f"[HUNTER] Dodano narzędzie: {name}")
+        logger.info("[HUNTER] Dodano narzędzie: %s", name)
 
     def add_data_provider(self, name, provider_fn):
         self.data_providers[name] = provider_fn
-        print(f"[HUNTER] Dodano źródło danych: {name}")
+        logger.info("[HUNTER] Dodano źródło danych: %s", name)
 
     def use_tool(self, name, *args, **kwargs):
         if name in self.tools:
             return self.tools[name](*args, **kwargs)
-        print(f"[HUNTER] Tool {name} not found!")
+        logger.warning("[HUNTER] Tool %s not found!", name)
         return None
 
     def get_data(self, name, *args, **kwargs):
         if name in self.data_providers:
             return self.data_providers[name](*args, **kwargs)
-        print(f"[HUNTER] Data provider {name} not found!")
+        logger.warning("[HUNTER] Data provider %s not found!", name)
         return None
 
+# =======================
+# PROSTE SENSORY-PLUGINY (activate/mutate/evaluate)
+# =======================
+class PluginSensor:
+    """Wspólna część sensorów-pluginów: poziom klucza `field` z danych rynkowych."""
+
+    field = None  # klucz danych rynkowych (np. "noise")
+
+    def process_into(self, data, out, idx):
+        """Zapisuje poziom `field` z danych rynkowych w out[idx] (skalar wprost, seria przez evaluate)."""
+        value = data.get(self.field, 0.0)
+        out[idx] = self.evaluate(value) if hasattr(value, "__len__") else value
+
 # =======================
 # KLASA BAZOWA SENSORA
 # =======================
 class BaseSensor:
+    __slots__ = (
+        'id', 'name', 'sensitivity', 'memory_size', 'memory', 'status', 'last_value',
+        'last_detection_time', 'learning_rate', 'autoconclone_count', 'window', 'base_level',
+        'adaptive_level', 'buffer', '_head', '_count', '_shift', '_sum', '_sumsq', 'history', 'hunger', 'growth_signal',
+        'knowledge_bank', '_kb_delta', '_kb_version', 'last_alert_time', 'hive', 'hunter', 'auto_log_path', 'cloud_sync'
+    )
+
+    # Parametry nadpisywane przez sensory specjalistyczne
+    field = None              # klucz ticka odczytywany przez sensor (np. "noise")
+    hunger_step = 0.1         # przyrost głodu przy braku anomalii
+    growth_threshold = 4.0    # próg głodu dla sygnału rozwoju
+
     def __init__(
             self,
             name="BaseSensor",
@@ -83,7 +255,7 @@ class BaseSensor:
         self.name = name
         self.sensitivity = sensitivity
         self.memory_size = memory_size
-        self.memory = []
+        self.memory = deque(maxlen=memory_size)
         self.status = "OK"
         self.last_value = None
         self.last_detection_time = None
@@ -94,11 +266,18 @@ class BaseSensor:
         self.window = window
         self.base_level = base_level
         self.adaptive_level = base_level
-        self.buffer = []
-        self.history = []
+        self.buffer = np.empty(window, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._shift = 0.0    # punkt odniesienia sum (≈ średnia bufora z ostatniego przeliczenia)
+        self._sum = 0.0      # suma bieżąca (x - _shift) próbek w buforze
+        self._sumsq = 0.0    # suma kwadratów (x - _shift) próbek w buforze
+        self.history = SensorHistory(memory_size)
         self.hunger = 0
         self.growth_signal = False
         self.knowledge_bank = set()
+        self._kb_delta = set()     # wzorce nauczone od ostatniej wymiany w roju
+        self._kb_version = 0       # licznik zmian banku wiedzy
         self.last_alert_time = 0
 
         # Integracje z systemami hive/hunter
@@ -114,14 +293,110 @@ class BaseSensor:
         detection = self.sensitivity * np.mean(data)
         self.last_value = detection
         self.memory.append((time.time(), detection))
-        if len(self.memory) > self.memory_size:
-            self.memory.pop(0)
         self.last_detection_time = time.time()
         return detection
 
+    def _push(self, x):
+        """Wstawia próbkę do bufora cyklicznego i aktualizuje sumy bieżące – O(1), bez alokacji."""
+        x = float(x)
+        if self._count == 0:
+            self._shift = x
+        d = x - self._shift
+        if self._count == self.window:
+            old = float(self.buffer[self._head]) - self._shift
+            self._sum += d - old
+            self._sumsq += d * d - old * old
+        else:
+            self._count += 1
+            self._sum += d
+            self._sumsq += d * d
+        self.buffer[self._head] = x
+        self._head = (self._head + 1) % self.window
+        if self._head == 0:
+            # Po pełnym obiegu bufora przelicz sumy dokładnie – błąd zaokrągleń się nie kumuluje
+            self._resync_sums()
+
+    def _resync_sums(self):
+        filled = self.buffer[:self._count]
+        if not self._count:
+            self._shift = self._sum = self._sumsq = 0.0
+            return
+        self._shift = float(filled.mean())
+        dev = filled - self._shift
+        self._sum = float(dev.sum())
+        self._sumsq = float(np.dot(dev, dev))
+
+    def _is_anomaly(self, x, mean, adaptive):
+        return abs(x - mean) > adaptive * 2
+
+    # --- PRZETWARZANIE WSADOWE ---
+    def read_batch(self, ticks):
+        """
+        Przetwarza N ticków naraz: kroczące średnie i odchylenia liczone wektorowo
+        z sum skumulowanych, rekurencja głodu/anomalii jednym skalarnym skanem.
+        Stan sensora (bufor, głód, próg) jak po N wywołaniach read(), bez logowania per tick.
+        ticks: ndarray wartości albo lista ticków-dictów z kluczem self.field.
+        Zwraca (means, stds, anomalies, hungers).
+        """
+        if len(ticks) and isinstance(ticks[0], dict):
+            ticks = [t[self.field] for t in ticks]
+        arr = np.asarray(ticks, dtype=np.float64).ravel()
+        n_new = arr.size
+        if n_new == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty, np.empty(0, dtype=bool), empty
+
+        # Chronologiczny widok bufora cyklicznego + nowe ticki
+        if self._count < self.window:
+            prev = self.buffer[:self._count]
+        else:
+            prev = np.concatenate((self.buffer[self._head:], self.buffer[:self._head]))
+        seq = np.concatenate((prev, arr))
+        # Sumy skumulowane odchyleń od średniej sekwencji – bez utraty precyzji przy dużych wartościach
+        shift = float(seq.mean())
+        dev = seq - shift
+        cs = np.concatenate(([0.0], np.cumsum(dev)))
+        cs2 = np.concatenate(([0.0], np.cumsum(dev * dev)))
+        end = np.arange(prev.size + 1, seq.size + 1)
+        start = np.maximum(end - self.window, 0)
+        counts = end - start
+        devs = (cs[end] - cs[start]) / counts
+        means = shift + devs
+        stds = np.sqrt(np.maximum((cs2[end] - cs2[start]) / counts - devs * devs, 0.0))
+
+        # Głód zależy od poprzednich anomalii – skan sekwencyjny na floatach Pythona
+        anomalies = np.empty(n_new, dtype=bool)
+        hungers = np.empty(n_new, dtype=np.float64)
+        hunger = self.hunger
+        adaptive = self.adaptive_level
+        base_level, lr, step = self.base_level, self.learning_rate, self.hunger_step
+        for i, (x, mean, std) in enumerate(zip(arr.tolist(), means.tolist(), stds.tolist())):
+            adaptive = base_level + lr * (std + hunger)
+            anomaly = self._is_anomaly(x, mean, adaptive)
+            hunger = max(0, hunger - 1) if anomaly else hunger + step
+            anomalies[i] = anomaly
+            hungers[i] = hunger
+
+        tail = seq[-self.window:]
+        self.buffer[:tail.size] = tail
+        self._count = tail.size
+        self._head = tail.size % self.window
+        self._resync_sums()
+        self.hunger = hunger
+        self.adaptive_level = adaptive
+        self.growth_signal = self.hunger > self.growth_threshold
+        return means, stds, anomalies, hungers
+
+    def learn(self, pattern):
+        """Zapamiętuje wzorzec w banku wiedzy i oznacza go do propagacji w roju."""
+        if pattern not in self.knowledge_bank:
+            self.knowledge_bank.add(pattern)
+            self._kb_delta.add(pattern)
+            self._kb_version += 1
+
     def receive_broadcast(self, msg):
         """Obsługa komunikatów z roju/hive."""
-        print(f"[{self.name}] Received broadcast: {msg}")
+        logger.debug("[%s] Received broadcast: %s", self.name, msg)
 
     # --- ADAPTACJA I UCZENIE ---
     def adjust_sensitivity(self, feedback):
@@ -130,7 +405,7 @@ class BaseSensor:
             self.sensitivity = max(0.01, self.sensitivity - self.learning_rate)
         elif feedback == "missed_event":
             self.sensitivity = min(10.0, self.sensitivity + self.learning_rate)
-        print(f"[{self.name}] Sensitivity changed: {old:.3f} -> {self.sensitivity:.3f}")
+        logger.debug("[%s] Sensitivity changed: %.3f -> %.3f", self.name, old, self.sensitivity)
 
     def reflect(self):
         if not self.memory:
@@ -144,7 +419,7 @@ class BaseSensor:
             "memory_size": len(self.memory),
             "last_value": self.last_value
         }
-        print(f"[{self.name}] Reflection: {reflection}")
+        logger.debug("[%s] Reflection: %s", self.name, reflection)
         return reflection
 
     # --- SAMOREPLIKACJA / KLONOWANIE ---
@@ -161,28 +436,71 @@ class BaseSensor:
             hive=self.hive,
             hunter=self.hunter
         )
-        print(f"[{self.name}] Autoclone created: {clone.name}")
+        logger.info("[%s] Autoclone created: %s", self.name, clone.name)
         if self.hive:
             self.hive.add(clone)
         return clone
 
     def clone(self):
+        """Klon z pełnym stanem (także pól podklas); od nowa tworzone są tylko bufory okna, pamięć i historia."""
         self.autoconclone_count += 1
-        new_sensor = copy.deepcopy(self)
+        new_sensor = self.__class__.__new__(self.__class__)
+        for key, value in self.get_state().items():
+            # Własne kopie zbiorów/słowników/list – klon nie dzieli stanu z oryginałem
+            if isinstance(value, (set, dict, list)):
+                value = copy.copy(value)
+            setattr(new_sensor, key, value)
         new_sensor.id = f"{self.id}_clone{self.autoconclone_count}"
-        print(f"[{self.id}] Klonuję siebie! Nowy sensor: {new_sensor.id}")
+        new_sensor._reset_buffers()
+        logger.info("[%s] Klonuję siebie! Nowy sensor: %s", self.id, new_sensor.id)
         if self.hive:
             self.hive.add(new_sensor)
         return new_sensor
 
+    def _reset_buffers(self):
+        """Puste bufory okna (z sumami bieżącymi), pamięć i historia – zamiast kopiowania tablic."""
+        if isinstance(self.buffer, np.ndarray):
+            self.buffer = np.empty(self.window, dtype=np.float64)
+        else:
+            self.buffer = type(self.buffer)()
+        self._head = 0
+        self._count = 0
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self.memory = deque(maxlen=self.memory_size)
+        self.history = SensorHistory(self.memory_size)
+
+    def get_state(self):
+        """Pełny stan sensora (sloty + ewentualny __dict__ podklas) jako dict."""
+        state = {}
+        for klass in type(self).__mro__:
+            for slot in getattr(klass, "__slots__", ()):
+                if hasattr(self, slot):
+                    state[slot] = getattr(self, slot)
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """Odtwarza sensor z pełnego stanu (get_state()) – gdy potrzebna głęboka kopia."""
+        sensor = cls.__new__(cls)
+        for key, value in copy.deepcopy(state).items():
+            setattr(sensor, key, value)
+        return sensor
+
     # --- LOGOWANIE I CLOUD ---
     def _auto_log(self, result):
         try:
-            os.makedirs(os.path.dirname(self.auto_log_path), exist_ok=True)
-            with open(self.auto_log_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            _log_handle(self.auto_log_path).write(_dumps(result))
         except Exception as e:
-            print(f"Log error: {e}")
+            logger.error("Log error: %s", e)
+
+    def flush_log(self):
+        """Wymusza zapis zbuforowanego logu na dysk."""
+        fh = _LOG_HANDLES.get(self.auto_log_path)
+        if fh is not None:
+            fh.flush()
 
     def _sync_cloud(self, result):
         # Wersja demo – podłącz pod GIE-hive/cloud
@@ -198,23 +516,25 @@ class BaseSensor:
 
 class NoiseSensor(BaseSensor):
     """Zaawansowany sensor do analizy szumu rynkowego."""
+    __slots__ = ()
+    field = "noise"
+    hunger_step = 0.1
+    growth_threshold = 4.0
+
     def read(self, tick_data):
         # Szum: np. niestabilność lub ilość mikrofluktuacji
         if not tick_data or "noise" not in tick_data:
             return None
-        noise = tick_data['noise']
-        self.buffer.append(noise)
-        if len(self.buffer) > self.window:
-            self.buffer.pop(0)
-        std_noise = np.std(self.buffer)
-        mean_noise = np.mean(self.buffer)
-        self.adaptive_level = self.base_level + self.learning_rate * (std_noise + self.hunger)
-        anomaly = abs(noise - mean_noise) > self.adaptive_level * 2
+        noise = float(tick_data['noise'])
+        self._push(noise)
+        mean_noise, std_noise, self.adaptive_level, anomaly = _tick_update(
+            self._shift, self._sum, self._sumsq, self._count, noise, self.base_level, self.learning_rate, self.hunger, 2.0
+        )
         if anomaly:
             self.hunger = max(0, self.hunger - 1)
         else:
-            self.hunger += 0.1
-        self.growth_signal = self.hunger > 4.0
+            self.hunger += self.hunger_step
+        self.growth_signal = self.hunger > self.growth_threshold
         info = f"noise={noise:.3f} μ={mean_noise:.3f} σ={std_noise:.3f} hunger={self.hunger:.2f}"
         result = {
             "id": self.id,
@@ -226,9 +546,9 @@ class NoiseSensor(BaseSensor):
             "info": info,
             "hunger": self.hunger,
             "growth_signal": self.growth_signal,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
         }
-        self.history.append(result)
+        self.history.append(result["timestamp"], noise, mean_noise, std_noise, anomaly, self.hunger)
         self._auto_log(result)
         if self.cloud_sync:
             self._sync_cloud(result)
@@ -236,22 +556,24 @@ class NoiseSensor(BaseSensor):
 
 class PressureSensor(BaseSensor):
     """Sensor do detekcji presji/ciśnienia na rynku."""
+    __slots__ = ()
+    field = "pressure"
+    hunger_step = 0.14
+    growth_threshold = 4.2
+
     def read(self, tick_data):
         if not tick_data or "pressure" not in tick_data:
             return None
-        pressure = tick_data['pressure']
-        self.buffer.append(pressure)
-        if len(self.buffer) > self.window:
-            self.buffer.pop(0)
-        mean_p = np.mean(self.buffer)
-        std_p = np.std(self.buffer)
-        self.adaptive_level = self.base_level + self.learning_rate * (std_p + self.hunger)
-        anomaly = abs(pressure - mean_p) > self.adaptive_level * 2
+        pressure = float(tick_data['pressure'])
+        self._push(pressure)
+        mean_p, std_p, self.adaptive_level, anomaly = _tick_update(
+            self._shift, self._sum, self._sumsq, self._count, pressure, self.base_level, self.learning_rate, self.hunger, 2.0
+        )
         if anomaly:
             self.hunger = max(0, self.hunger - 1)
         else:
-            self.hunger += 0.14
-        self.growth_signal = self.hunger > 4.2
+            self.hunger += self.hunger_step
+        self.growth_signal = self.hunger > self.growth_threshold
         info = f"pressure={pressure:.2f} μ={mean_p:.2f} σ={std_p:.2f} hunger={self.hunger:.2f}"
         result = {
             "id": self.id,
@@ -263,9 +585,9 @@ class PressureSensor(BaseSensor):
             "info": info,
             "hunger": self.hunger,
             "growth_signal": self.growth_signal,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
         }
-        self.history.append(result)
+        self.history.append(result["timestamp"], pressure, mean_p, std_p, anomaly, self.hunger)
         self._auto_log(result)
         if self.cloud_sync:
             self._sync_cloud(result)
@@ -273,22 +595,28 @@ class PressureSensor(BaseSensor):
 
 class SuperVolumeSensor(BaseSensor):
     """Zaawansowany sensor do analizy wolumenu."""
+    __slots__ = ()
+    field = "volume"
+    hunger_step = 0.11
+    growth_threshold = 5.5
+
+    def _is_anomaly(self, x, mean, adaptive):
+        return x > (adaptive * 2) or x < (adaptive * 0.5)
+
     def read(self, tick_data):
         if not tick_data or "volume" not in tick_data:
             return None
-        volume = tick_data['volume']
-        self.buffer.append(volume)
-        if len(self.buffer) > self.window:
-            self.buffer.pop(0)
-        mean_volume = np.mean(self.buffer)
-        std_volume = np.std(self.buffer)
-        self.adaptive_level = self.base_level + self.learning_rate * (std_volume + self.hunger)
-        anomaly = volume > (self.adaptive_level * 2) or volume < (self.adaptive_level * 0.5)
+        volume = float(tick_data['volume'])
+        self._push(volume)
+        mean_volume, std_volume, self.adaptive_level, _ = _tick_update(
+            self._shift, self._sum, self._sumsq, self._count, volume, self.base_level, self.learning_rate, self.hunger, 2.0
+        )
+        anomaly = self._is_anomaly(volume, mean_volume, self.adaptive_level)
         if anomaly:
             self.hunger = max(0, self.hunger - 1)
         else:
-            self.hunger += 0.11
-        self.growth_signal = self.hunger > 5.5
+            self.hunger += self.hunger_step
+        self.growth_signal = self.hunger > self.growth_threshold
         info = f"vol={volume:.2f} μ={mean_volume:.2f} σ={std_volume:.2f} hunger={self.hunger:.2f}"
         result = {
             "id": self.id,
@@ -300,9 +628,9 @@ class SuperVolumeSensor(BaseSensor):
             "info": info,
             "hunger": self.hunger,
             "growth_signal": self.growth_signal,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
         }
-        self.history.append(result)
+        self.history.append(result["timestamp"], volume, mean_volume, std_volume, anomaly, self.hunger)
         self._auto_log(result)
         if self.cloud_sync:
             self._sync_cloud(result)
@@ -312,6 +640,8 @@ class SuperVolumeSensor(BaseSensor):
 # DEMO: JAK TO DZIAŁA
 # ============================
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Tworzymy systemy hive i hunter
     hive = Hive()
     hunter = HunterTools()
@@ -327,14 +657,10 @@ if __name__ == "__main__":
     hive.add(noise_sensor)
     hive.add(pressure_sensor)
 
-    # Przykładowa symulacja ticków
-    for i in range(50):
-        tick_vol = {'volume': abs(np.random.normal(1.2, 0.25))}
-        tick_noise = {'noise': np.random.normal(0, 1)}
-        tick_pressure = {'pressure': np.random.normal(100, 4)}
-        vol_sensor.read(tick_vol)
-        noise_sensor.read(tick_noise)
-        pressure_sensor.read(tick_pressure)
+    # Przykładowa symulacja 50 ticków – wsadowo, jedno wywołanie na sensor
+    vol_sensor.read_batch(np.abs(np.random.normal(1.2, 0.25, 50)))
+    noise_sensor.read_batch(np.random.normal(0, 1, 50))
+    pressure_sensor.read_batch(np.random.normal(100, 4, 50))
 
     # Wymiana wiedzy w roju
     hive.share_knowledge()
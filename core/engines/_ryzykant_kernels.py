@@ -0,0 +1,33 @@
+# core/engines/_ryzykant_kernels.py
+# Skompilowane (numba) jądra liczbowe RyzykantEngine – bez numby działają jako zwykły Python
+
+try:
+    from numba import njit as _njit
+except ImportError:
+    def _njit(*args, **kwargs):
+        # Brak numby: dekorator przepuszcza funkcję bez zmian
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+import numpy as np
+
+
+@_njit(cache=True, fastmath=True)
+def _base_chance(noise, pressure, volume, alt_sum, reward_bias):
+    """
+    Jedyna definicja szansy rynkowej RyzykantEngine, przyciętej do [0, 1.2].
+    Działa na skalarach (decide) i na tablicach numpy (run_batch).
+    """
+    op = (0.2 * (pressure + 0.3 * volume + 0.2) + noise * 0.05 + alt_sum * 0.05) * reward_bias
+    return np.minimum(np.maximum(op, 0.0), 1.2)
+
+
+@_njit(cache=True, fastmath=True)
+def _analyze_market_kernel(noise, pressure, volume, alt_vals, reward_bias):
+    """Szansa rynkowa z poziomów sensorów i tablicy float64 sygnałów alternatywnych."""
+    alt_sum = 0.0
+    for i in range(alt_vals.shape[0]):
+        alt_sum += alt_vals[i]
+    return _base_chance(noise, pressure, volume, alt_sum, reward_bias)
@@ -1,22 +1,233 @@
+import asyncio
+import atexit
 import os
 import json
+import queue
 import random
+import sys
+import threading
 import time
 import datetime
+import weakref
+from collections import deque
+from itertools import islice
 import MetaTrader5 as mt5
 
 from utils.logger import Logger
 from utils.meta_logger import MetaLogger
 from core.base_engine import BaseEngine
+from core.base_sensor import _dumps, _json_default
 from core.meta_reflection import MetaReflection
 from core.gie_manifest import gie_manifest
 from core.sensors.sag_sensor import SuperAggressiveSensor
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Log silnika: wątek tła pisze na stdout, tick tylko wrzuca gotową linię do kolejki
+_LOG_Q = queue.SimpleQueue()
+_LOG_THREAD = None
+
+def _log_writer():
+    while True:
+        sys.stdout.write(_LOG_Q.get())
+        if _LOG_Q.empty():
+            sys.stdout.flush()
+
+def _start_log_writer():
+    global _LOG_THREAD
+    if _LOG_THREAD is None:
+        _LOG_THREAD = threading.Thread(target=_log_writer, name="agresywny-log", daemon=True)
+        _LOG_THREAD.start()
+
+@atexit.register
+def _drain_log():
+    while True:
+        try:
+            sys.stdout.write(_LOG_Q.get_nowait())
+        except queue.Empty:
+            break
+    sys.stdout.flush()
+
+def _is_msgpack(path):
+    return path.endswith(".msgpack")
+
+def _record_encoder(path):
+    # .msgpack: strumień sklejonych obiektów MessagePack (dopisywalny jak NDJSON); reszta: NDJSON
+    if _is_msgpack(path):
+        return msgpack.Packer(use_bin_type=True, default=_json_default).pack
+    return _dumps
+
+def _encode_records(path, records):
+    return b"".join(map(_record_encoder(path), records))
+
+def _read_records(path):
+    """Wczytuje rekordy ze strumienia MessagePack, pliku NDJSON (jeden JSON na linię) lub starszej tablicy JSON."""
+    with open(path, "rb") as f:
+        if _is_msgpack(path):
+            return list(msgpack.Unpacker(f, raw=False)), False
+        data = f.read()
+    if data.lstrip().startswith(b"["):
+        return _loads(data), True
+    return [_loads(line) for line in data.splitlines() if line.strip()], False
+
+def _count_records(path):
+    """Liczba rekordów w pliku (0 gdy go brak); starszą tablicę JSON konwertuje od razu do formatu dopisywalnego."""
+    if not os.path.isfile(path):
+        return 0
+    if _is_msgpack(path):
+        with open(path, "rb") as f:
+            return sum(1 for _ in msgpack.Unpacker(f, raw=False))
+    with open(path, "rb") as f:
+        head = f.read(64).lstrip()
+        if head.startswith(b"["):
+            records = _loads(head + f.read())
+            _write_records_atomic(path, records)
+            return len(records)
+        f.seek(0)
+        return sum(1 for line in f if line.strip())
+
+def _append_records(path, records):
+    with open(path, "ab") as f:
+        f.write(_encode_records(path, records))
+
+def _stage(buf, chunks):
+    """Składa zakodowane rekordy w buf (podwajając go w razie potrzeby); zwraca liczbę bajtów."""
+    cursor = 0
+    for chunk in chunks:
+        end = cursor + len(chunk)
+        if end > len(buf):
+            buf.extend(bytes(max(len(buf), end - len(buf))))
+        buf[cursor:end] = chunk
+        cursor = end
+    return cursor
+
+def _write_buf(fd, buf, n):
+    with memoryview(buf) as mv:
+        done = 0
+        while done < n:
+            done += os.write(fd, mv[done:n])
+
+def _write_records_atomic(path, records):
+    """Pełny zapis przez plik tymczasowy + os.replace (bez połowicznych plików)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_encode_records(path, records))
+    os.replace(tmp_path, path)
+
+# Pamięć wszystkich silników: jedna kolejka (silnik, rekord) i jeden wątek zapisu.
+# Wątek nie trzyma referencji do silników między paczkami, więc klony mogą być zwalniane.
+_MEM_Q = queue.Queue()
+_MEM_THREAD = None
+_MEM_MAX_BATCH = 64     # maks. rekordów na jedną paczkę...
+_MEM_MAX_DELAY = 0.05   # ...lub tyle sekund czekania na kolejne rekordy
+_MEM_LOCK = threading.Lock()
+_MEM_FDS = {}           # plik pamięci -> deskryptor O_APPEND współdzielony przez silniki (i klony)
+_MEM_WBUF = bytearray(65536)
+
+def _collect_mem_batch():
+    # Paczka: pierwszy rekord + wszystko, co dojdzie w _MEM_MAX_DELAY (maks. _MEM_MAX_BATCH)
+    batch = [_MEM_Q.get()]
+    deadline = time.monotonic() + _MEM_MAX_DELAY
+    while len(batch) < _MEM_MAX_BATCH:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(_MEM_Q.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+def _write_mem_batch(batch):
+    groups = {}
+    for engine, record in batch:
+        groups.setdefault(engine, []).append(record)
+    try:
+        for engine, records in groups.items():
+            try:
+                with _MEM_LOCK:
+                    fd = _MEM_FDS.get(engine.memory_file)
+                    if fd is None:
+                        fd = _MEM_FDS[engine.memory_file] = os.open(
+                            engine.memory_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+                    _write_buf(fd, _MEM_WBUF, _stage(_MEM_WBUF, map(engine._encode, records)))
+                engine._persisted_len += len(records)
+            except Exception as e:
+                engine.log(f"Nie udało się zapisać pamięci: {e}")
+    finally:
+        for _ in batch:
+            _MEM_Q.task_done()
+
+def _mem_writer():
+    # Paczka żyje tylko w wywołaniach pomocniczych – czekając na get() wątek nie trzyma silników
+    while True:
+        _write_mem_batch(_collect_mem_batch())
+
+def _start_mem_writer():
+    global _MEM_THREAD
+    if _MEM_THREAD is None:
+        _MEM_THREAD = threading.Thread(target=_mem_writer, name="agresywny-memory", daemon=True)
+        _MEM_THREAD.start()
+
+def _close_mem_fd(path):
+    with _MEM_LOCK:
+        fd = _MEM_FDS.pop(path, None)
+        if fd is not None:
+            os.close(fd)
+
+# Żywe silniki – przy wyjściu dopisujemy ich zaległe rekordy
+_ENGINES = weakref.WeakSet()
+
+@atexit.register
+def _flush_engines():
+    for engine in list(_ENGINES):
+        engine.save_memory()
+    for path in list(_MEM_FDS):
+        _close_mem_fd(path)
+
 class AgresywnyEngine(BaseEngine):
-    def __init__(self, symbol="EURUSD", lot=0.04, memory_file="agresywny_memory.json", sensors=None):
+    flush_max_pending = 256  # tyle rekordów spoza logu wymusza zapis przed upływem flush_every
+
+    def __init__(self, symbol="EURUSD", lot=0.04, memory_file=None, sensors=None, flush_every=16,
+                 memory_window=2048):
         super().__init__(name="Agresywny", symbol=symbol, lot=lot, sensors=sensors)
+        self._last_sec = -1     # sekunda, dla której zbudowano _ts_prefix
+        self._ts_prefix = ""
+        _start_log_writer()
+        # Pamięć binarnie (MessagePack) gdy msgpack jest dostępny, inaczej NDJSON
+        if memory_file is None:
+            memory_file = "agresywny_memory.msgpack" if msgpack is not None else "agresywny_memory.json"
+        elif _is_msgpack(memory_file) and msgpack is None:
+            memory_file = memory_file[:-len(".msgpack")] + ".json"
         self.memory_file = memory_file
-        self.own_memory = []
+        # Zapis przez stały deskryptor i wielokrotnie używane bufory – jedno os.write na paczkę
+        self._encode = _record_encoder(memory_file)
+        self._wbuf = bytearray(65536)      # szczęście (wątek silnika)
+        self._happy_fd = None
+        self._happy_persisted = -1  # wartość happy_points ostatnio zapisana do pliku
+        # Zapis stanu (pamięć, szczęście, log) zbiorczo co flush_every ticków, tylko zmienionych części
+        self.flush_every = flush_every
+        self._dirty = {"happy": False, "log": False}
+        self._ticks_since_flush = 0
+        self._flushed_total = 0    # _total przy ostatnim flush_state
+        # W RAM tylko okno ostatnich rekordów; pełna historia żyje w pliku pamięci (NDJSON)
+        self.own_memory = deque(maxlen=memory_window)
+        self._total = 0            # ile rekordów przeszło przez own_memory (łącznie z wczytanymi)
+        self._persisted_len = 0    # ile z nich jest już w pliku pamięci (aktualizuje wątek zapisu)
+        # Nowe rekordy pamięci idą kolejką do wspólnego wątku zapisu – tick nie czeka na I/O
+        _start_mem_writer()
+        _ENGINES.add(self)
+        self._log_cursors = {}     # plik logu -> liczba zapisanych rekordów
+        self._meta_cache = (None, None)  # (klucz stanu pamięci, wynik meta_reflector.analyze)
         self.happy_points = 0
         self.sad_points = 0
         self.hunger = 1.0
@@ -29,14 +240,38 @@ class AgresywnyEngine(BaseEngine):
         self.last_result = None
         self.profit_threshold = 1.5
         self.loss_threshold = -1.0
+
+        # Stałe MT5 i szablony zleceń budowane raz – per zlecenie zmieniamy tylko wolumen/typ/cenę
+        self._BUY = mt5.ORDER_TYPE_BUY
+        self._SELL = mt5.ORDER_TYPE_SELL
+        self._DONE = mt5.TRADE_RETCODE_DONE
+        self._open_req_template = {
+            "action": mt5.TRADE_ACTION_DEAL,
+            "symbol": self.symbol,
+            "volume": 0.0,
+            "type": self._BUY,
+            "price": 0.0,
+            "deviation": 10,
+            "magic": 123456,
+            "comment": "AgresywnyEngine",
+            "type_time": mt5.ORDER_TIME_GTC,
+            "type_filling": mt5.ORDER_FILLING_IOC,
+        }
+        self._close_req_template = dict(self._open_req_template, comment="AgresywnyEngine CLOSE", position=0)
         self.log("Engine initialized.")
         self.load_memory()
 
     def log(self, msg):
-        print(f"[AgresywnyEngine][{time.strftime('%H:%M:%S')}] {msg}")
+        now = int(time.time())
+        if now != self._last_sec:
+            # strftime raz na sekundę, nie przy każdej linii
+            self._last_sec = now
+            self._ts_prefix = f"[AgresywnyEngine][{time.strftime('%H:%M:%S', time.localtime(now))}]"
+        _LOG_Q.put(f"{self._ts_prefix} {msg}\n")
 
     def add_happy_point(self, reason=""):
         self.happy_points += 1
+        self._dirty["happy"] = True
         self.log(f"😃 Szczęśliwy tick! (happy_points: {self.happy_points}) Powód: {reason}")
         if self.happy_points % 10 == 0:
             self.log("🔥 Osiągnąłem kolejny poziom szczęścia!")
@@ -65,27 +300,31 @@ class AgresywnyEngine(BaseEngine):
         return False
 
     def tick(self):
-        # 1. Zamykanie pozycji
+        # Jeden odczyt ceny i pozycji z terminala na tick (każde wywołanie mt5 to round-trip IPC)
+        tick = mt5.symbol_info_tick(self.symbol)
         positions = mt5.positions_get(symbol=self.symbol)
+
+        # 1. Zamykanie pozycji
         if positions:
-            for position in positions:
-                if self.should_close_position(position):
-                    self.close_trade(position)
-                    if hasattr(position, 'profit') and position.profit > 0:
-                        self.add_happy_point("Zysk na zamknięciu pozycji!")
-                    else:
-                        self.add_sad_point("Strata na zamknięciu pozycji.")
+            to_close = [position for position in positions if self.should_close_position(position)]
+            if to_close:
+                self.close_trades(to_close, tick=tick)
+            for position in to_close:
+                if hasattr(position, 'profit') and position.profit > 0:
+                    self.add_happy_point("Zysk na zamknięciu pozycji!")
+                else:
+                    self.add_sad_point("Strata na zamknięciu pozycji.")
 
         # 2. Decyzja o otwarciu pozycji
         open_decision = False
-        if random.random() < self.hunger:
+        if self._rand() < self.hunger:
             open_decision = True
-        elif random.random() < self.curiosity:
+        elif self._rand() < self.curiosity:
             open_decision = True
 
         if open_decision:
-            direction = random.choice(["buy", "sell"])
-            result = self.open_trade(direction)
+            direction = "buy" if self._rand() < 0.5 else "sell"
+            result = self.open_trade(direction, tick=tick)
             if result:
                 self.add_happy_point(f"Otwarcie pozycji {direction}")
             else:
@@ -103,39 +342,125 @@ class AgresywnyEngine(BaseEngine):
             self.curiosity += 0.05
 
         # 4. Meta-refleksja (co 5 ticków)
-        if len(self.own_memory) > 0 and len(self.own_memory) % 5 == 0:
-            meta_summary = self.meta_reflector.analyze(self.own_memory)
+        if self._total > 0 and self._total % 5 == 0:
+            meta_summary = self._meta_summary()
             self.log(f"[META] Wnioski meta-refleksji: {meta_summary}")
 
-        # 5. Zapis wszystkiego
-        self.save_memory()
-        self.save_happy_points()
-        self.save_log()
+        # 5. Zapis stanu (zbiorczo, co flush_every ticków)
+        self._maybe_flush()
+
+    def _meta_summary(self):
+        # Pamięć bez zmian od ostatniej analizy (np. ticki odpoczynku) – zwróć zapamiętany wynik
+        key = (self._total, self.own_memory[-1]['ts'] if self.own_memory else 0)
+        if key == self._meta_cache[0]:
+            return self._meta_cache[1]
+        meta_summary = self.meta_reflector.analyze(self.own_memory)
+        self._meta_cache = (key, meta_summary)
+        return meta_summary
+
+    def _remember(self, record):
+        # Kolejka trzyma rekord do zapisu, więc wypchnięcie z okna niczego nie gubi
+        self.own_memory.append(record)
+        self._total += 1
+        _MEM_Q.put_nowait((self, record))
+        self._dirty["log"] = True
+
+    def _records_since(self, written):
+        """Rekordy dodane po `written`-tym; None gdy część wypadła już z okna."""
+        n = self._total - written
+        if n <= 0:
+            return []
+        if n > len(self.own_memory):
+            return None
+        return list(islice(self.own_memory, len(self.own_memory) - n, None))
+
+    def _maybe_flush(self):
+        self._ticks_since_flush += 1
+        pending = self._total - self._flushed_total
+        if self._ticks_since_flush >= self.flush_every or pending >= self.flush_max_pending:
+            self.flush_state()
+
+    def flush_state(self):
+        """Jeden zbiorczy zapis wszystkich zmienionych części stanu."""
+        try:
+            if self._dirty["happy"]:
+                self.save_happy_points()
+            if self._dirty["log"]:
+                self.save_log()
+        finally:
+            for key in self._dirty:
+                self._dirty[key] = False
+            self._ticks_since_flush = 0
+            self._flushed_total = self._total
+
+    def _reset_memory(self, records):
+        self.own_memory = deque(records, maxlen=self.own_memory.maxlen)
+        self._total = self._persisted_len = self._flushed_total = len(records)
+        self._log_cursors.clear()
+        self._meta_cache = (None, None)
+
+    def close_files(self):
+        # Deskryptor pamięci jest współdzielony – wątek zapisu otworzy go ponownie przy kolejnym rekordzie
+        _close_mem_fd(self.memory_file)
+        if self._happy_fd is not None:
+            os.close(self._happy_fd)
+            self._happy_fd = None
+
+    def __del__(self):
+        try:
+            if self._happy_fd is not None:
+                os.close(self._happy_fd)
+                self._happy_fd = None
+        except Exception:
+            pass
 
     def load_memory(self):
-        if os.path.isfile(self.memory_file):
+        _MEM_Q.join()
+        self.close_files()  # plik pamięci może zostać podmieniony (konwersja) – deskryptor otworzymy od nowa
+        legacy_file = self.memory_file[:-len(".msgpack")] + ".json" if _is_msgpack(self.memory_file) else None
+        if os.path.isfile(self.memory_file) or (legacy_file and os.path.isfile(legacy_file)):
             try:
-                with open(self.memory_file, "r", encoding="utf-8") as f:
-                    self.own_memory = json.load(f)
+                if os.path.isfile(self.memory_file):
+                    records, legacy = _read_records(self.memory_file)
+                else:
+                    # Jednorazowa migracja pamięci JSON do pliku MessagePack
+                    records, legacy = _read_records(legacy_file)[0], True
+                if legacy:
+                    # Jednorazowa konwersja starego formatu (dalej tylko dopisywanie)
+                    _write_records_atomic(self.memory_file, records)
+                self._reset_memory(records)
                 self.log("Pamięć wczytana.")
             except Exception as e:
                 self.log(f"Nie udało się wczytać pamięci: {e}")
         else:
-            self.own_memory = []
+            self._reset_memory([])
             self.log("Brak wcześniejszej pamięci, czysta karta.")
 
     def save_memory(self):
-        try:
-            with open(self.memory_file, "w", encoding="utf-8") as f:
-                json.dump(self.own_memory, f, ensure_ascii=False, indent=2)
-            self.log("Pamięć zapisana.")
-        except Exception as e:
-            self.log(f"Nie udało się zapisać pamięci: {e}")
+        """Czeka, aż wątek zapisu dopisze do pliku pamięci wszystkie rekordy z kolejki."""
+        _MEM_Q.join()
+        self.log("Pamięć zapisana.")
+
+    def export_memory_json(self, filename="agresywny_memory_export.json"):
+        """Eksport całej pamięci z pliku do czytelnego JSON (debugowanie pamięci binarnej)."""
+        self.save_memory()
+        records = _read_records(self.memory_file)[0] if os.path.isfile(self.memory_file) else []
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False, indent=2, default=_json_default)
+        self.log(f"Pamięć wyeksportowana do {filename}")
+        return filename
 
     def save_happy_points(self):
+        if self.happy_points == self._happy_persisted:
+            return  # bez zmian od ostatniego zapisu
         try:
-            with open("agresywny_happy.json", "w", encoding="utf-8") as f:
-                json.dump({"happy_points": self.happy_points}, f, ensure_ascii=False, indent=2)
+            if self._happy_fd is None:
+                self._happy_fd = os.open("agresywny_happy.json", os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            n = _stage(self._wbuf, (_dumps({"happy_points": self.happy_points}),))
+            os.lseek(self._happy_fd, 0, os.SEEK_SET)
+            _write_buf(self._happy_fd, self._wbuf, n)
+            os.ftruncate(self._happy_fd, n)
+            self._happy_persisted = self.happy_points
             self.log("Szczęście zapisane.")
         except Exception as e:
             self.log(f"[Happy][ERROR] Nie można zapisać szczęścia: {e}")
@@ -144,32 +469,24 @@ class AgresywnyEngine(BaseEngine):
         emotion = "😃 [ZADOWOLONY]" if positive else "😞 [SMUTNY]"
         self.log(f"{emotion} {msg}")
 
-    def open_trade(self, direction, custom_lot=None):
+    def open_trade(self, direction, custom_lot=None, tick=None):
         lot = custom_lot if custom_lot else self.lot
         if lot < 0.04:
             lot = 0.04  # Minimalny lot zgodny z RoboForex ECN demo
 
-        tick = mt5.symbol_info_tick(self.symbol)
+        tick = tick or mt5.symbol_info_tick(self.symbol)
         price = tick.ask if direction == "buy" else tick.bid
 
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": self.symbol,
-            "volume": lot,
-            "type": mt5.ORDER_TYPE_BUY if direction == "buy" else mt5.ORDER_TYPE_SELL,
-            "price": price,
-            "deviation": 10,
-            "magic": 123456,
-            "comment": "AgresywnyEngine",
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
-        }
+        request = self._open_req_template
+        request["volume"] = lot
+        request["type"] = self._BUY if direction == "buy" else self._SELL
+        request["price"] = price
 
         result = mt5.order_send(request)
         self.log(f"Otwieram pozycję {direction.upper()} {lot} {self.symbol} | Result: {result}")
 
-        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-            self.own_memory.append({
+        if result and result.retcode == self._DONE:
+            self._remember({
                 'action': direction,
                 'result': 'open',
                 'profit': 0,
@@ -180,7 +497,7 @@ class AgresywnyEngine(BaseEngine):
             return True
         else:
             self.log(f"[ERROR] Kod błędu: {getattr(result, 'retcode', 'brak')}")
-            self.own_memory.append({
+            self._remember({
                 'action': direction,
                 'result': 'fail',
                 'profit': 0,
@@ -189,26 +506,31 @@ class AgresywnyEngine(BaseEngine):
             })
             return False
 
-    def close_trade(self, position):
-        tick = mt5.symbol_info_tick(self.symbol)
-        price = tick.bid if position.type == mt5.ORDER_TYPE_BUY else tick.ask
-        request = {
-            "action": mt5.TRADE_ACTION_DEAL,
-            "symbol": self.symbol,
-            "volume": position.volume,
-            "type": mt5.ORDER_TYPE_SELL if position.type == mt5.ORDER_TYPE_BUY else mt5.ORDER_TYPE_BUY,
-            "price": price,
-            "deviation": 10,
-            "magic": 123456,
-            "comment": "AgresywnyEngine CLOSE",
-            "position": position.ticket,
-            "type_time": mt5.ORDER_TIME_GTC,
-            "type_filling": mt5.ORDER_FILLING_IOC,
-        }
-        result = mt5.order_send(request)
+    def _fill_close_request(self, request, position, tick):
+        is_buy = position.type == self._BUY
+        request["volume"] = position.volume
+        request["type"] = self._SELL if is_buy else self._BUY
+        request["price"] = tick.bid if is_buy else tick.ask
+        request["position"] = position.ticket
+        return request
+
+    def close_trade(self, position, tick=None):
+        tick = tick or mt5.symbol_info_tick(self.symbol)
+        request = self._fill_close_request(self._close_req_template, position, tick)
+        return self._record_close(position, mt5.order_send(request))
+
+    def close_trades(self, positions, tick=None):
+        """
+        Zamyka kilka pozycji po kolei jednym tickiem cenowym i wspólnym szablonem zlecenia
+        (API terminala MT5 nie jest gwarantowane jako bezpieczne wątkowo – bez równoległej wysyłki).
+        """
+        tick = tick or mt5.symbol_info_tick(self.symbol)
+        return [self.close_trade(p, tick=tick) for p in positions]
+
+    def _record_close(self, position, result):
         self.log(f"Zamykam pozycję (ticket {position.ticket}) | Result: {result}")
-        if result and result.retcode == mt5.TRADE_RETCODE_DONE:
-            self.own_memory.append({
+        if result and result.retcode == self._DONE:
+            self._remember({
                 'action': 'close',
                 'result': 'open',
                 'profit': position.profit,
@@ -217,7 +539,7 @@ class AgresywnyEngine(BaseEngine):
             })
             return True
         else:
-            self.own_memory.append({
+            self._remember({
                 'action': 'close',
                 'result': 'fail',
                 'profit': position.profit,
@@ -235,37 +557,56 @@ class AgresywnyEngine(BaseEngine):
 
     def save_log(self, filename="agresywny_log.json"):
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(self.own_memory, f, ensure_ascii=False, indent=2)
+            written = self._log_cursors.get(filename)
+            if written is None:
+                # Pierwszy zapis w sesji: plik ma już historię sprzed restartu – dopisujemy tylko to, czego w nim brak
+                written = _count_records(filename)
+            pending = self._records_since(written)
+            if pending is None:
+                # Zaległość dłuższa niż okno – brakujące rekordy bierzemy z pełnej historii w pliku pamięci
+                _MEM_Q.join()
+                pending = _read_records(self.memory_file)[0][written:self._total]
+            if pending:
+                _append_records(filename, pending)
+            self._log_cursors[filename] = self._total
             self.log(f"Log zapisany do pliku {filename}")
         except Exception as e:
             self.log(f"[Happy][ERROR] Nie udało się zapisać logu: {e}")
 
     def load_log(self, filename="agresywny_log.json"):
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                self.own_memory = json.load(f)
+            records, legacy = _read_records(filename)
+            if legacy:
+                _write_records_atomic(filename, records)
+            self._reset_memory(records)
+            self._log_cursors[filename] = self._total
             self.log(f"Log wczytany z pliku {filename}")
         except Exception as e:
             self.log(f"[Happy][ERROR] Nie udało się wczytać logu: {e}")
 
-    def run_autonomous_cycle(self, cycles=10, delay=10, meta_interval=5):
+    async def run_autonomous_cycle_async(self, cycles=10, delay=10, meta_interval=5):
+        """
+        Cykl autonomiczny na asyncio: tick (IPC z MT5, zapis stanu) biegnie w wątku
+        równolegle z odliczaniem `delay` – cykl trwa max(tick, delay) zamiast tick + delay.
+        """
         for i in range(cycles):
             print(f"\nCYCLE {i+1}:")
-            self.tick()
-            self.save_memory()
-            self.save_happy_points()
-            self.save_log()
+            tick_task = asyncio.create_task(asyncio.to_thread(self.tick))
+            await asyncio.sleep(delay)
+            await tick_task
 
             if (i+1) % meta_interval == 0:
                 print(f"\n[META] Analiza meta-refleksyjna po {i+1} cyklach...")
-                meta_summary = self.meta_reflector.analyze(self.own_memory)
+                meta_summary = self._meta_summary()
                 print(f"[META] Wynik analizy: {meta_summary}")
                 self.log(f"[META] {meta_summary}")
-
-            time.sleep(delay)
+        await asyncio.to_thread(self.flush_state)
+        await asyncio.to_thread(self.save_memory)
         print("[GIE] Zakończono autonomiczny cykl.")
 
+    def run_autonomous_cycle(self, cycles=10, delay=10, meta_interval=5):
+        asyncio.run(self.run_autonomous_cycle_async(cycles=cycles, delay=delay, meta_interval=meta_interval))
+
 if __name__ == "__main__":
     print("[INIT] Startuję GIE AgresywnyEngine")
     sag_sensor = SuperAggressiveSensor(window=120, hunger=1.2)
@@ -1,7 +1,9 @@
 import os
 import random
+from collections import deque
+from itertools import islice
 import numpy as np
-import datetime
+import time
 
 from utils.logger import get_logger
 from core.base_engine import BaseEngine
@@ -13,6 +15,10 @@ from core.sensors.pressure_sensor import PressureSensor
 from core.sensors.volume_sensor import VolumeSensor
 from core.sensors.sensor_hunter import SensorHunter
 
+def _clip01(x):
+    # Skalarny clip bez narzutu wywołania numpy
+    return 0.0 if x < 0 else 1.0 if x > 1 else x
+
 class OstroznyEngine(BaseEngine):
     """
     Silnik 'Ostrożny' | wyspecjalizowany w minimalizacji ryzyka, analizie niepewności i zachowaniu kapitału.
@@ -27,25 +33,32 @@ class OstroznyEngine(BaseEngine):
             "pressure": PressureSensor(),
             "volume": VolumeSensor()
         }
-        self.meta_reflection = MetaReflection(self)
+        # Poziomy sensorów w jednej tablicy (noise, pressure, volume) – bez słowników pośrednich na decyzję
+        self._sensor_order = ("noise", "pressure", "volume")
+        self._sense_buf = np.empty(3, dtype=np.float64)
+        self.meta_reflection = MetaReflection()
         self.hive_api = hive_api
         self.manifest = manifest if manifest else gie_manifest()
         self.risk_aversion = config.get("risk_aversion", 0.8) if config else 0.8
         self.last_action = None
-        self.success_history = []
-        self.memory = []
+        self.success_history = deque(maxlen=1000)
+        # Ostatnie 5 wyników (1.0/0.0) z sumą bieżącą – średnia w O(1) przy każdej decyzji
+        self._recent_success = deque(maxlen=5)
+        self._recent_success_sum = 0.0
+        self.memory = deque(maxlen=2048)  # okno ostatnich decyzji – pamięć nie rośnie bez końca
         self.curiosity = config.get("curiosity", 0.1) if config else 0.1
         self.hunger = 0.0  # Wewnętrzny stan "głodu" sukcesu (do samoregulacji)
 
     def sense_market(self, data):
         """
         Odbiera i analizuje dane rynkowe przez sensory.
+        Zwraca współdzieloną tablicę poziomów (noise, pressure, volume) – nadpisywaną przy kolejnym odczycie.
         """
-        sensory_data = {}
-        for name, sensor in self.sensors.items():
-            sensory_data[name] = sensor.process(data)
-        self.logger.debug(f"Sensory data: {sensory_data}")
-        return sensory_data
+        sensors = self.sensors
+        for i, name in enumerate(self._sensor_order):
+            sensors[name].process_into(data, self._sense_buf, i)
+        self.logger.debug("Sensory data: %s", self._sense_buf)
+        return self._sense_buf
 
     def decide(self, market_data):
         """
@@ -55,8 +68,8 @@ class OstroznyEngine(BaseEngine):
         risk_score = self.estimate_risk(sensory)
         opportunity_score = self.estimate_opportunity(sensory)
 
-        # Meta-refleksja: uczenie się na błędach i sukcesach
-        self.meta_reflection.reflect(self.memory, self.success_history)
+        # Meta-refleksja: uczenie się na błędach i sukcesach (okno pamięci zdarzeń MetaReflection)
+        self.meta_reflection.reflect()
 
         # Mechanizm ostrożności: priorytet bezpieczeństwa kapitału
         if risk_score > self.risk_aversion:
@@ -70,8 +83,8 @@ class OstroznyEngine(BaseEngine):
         # Zapisywanie decyzji i refleksja
         self.last_action = action
         self.memory.append({
-            "timestamp": datetime.datetime.utcnow().isoformat(),
-            "sensory": sensory,
+            "timestamp": time.time_ns(),
+            "sensory": sensory.tolist(),
             "risk": risk_score,
             "opportunity": opportunity_score,
             "action": action
@@ -81,37 +94,53 @@ class OstroznyEngine(BaseEngine):
 
     def estimate_risk(self, sensory):
         """
-        Ocena ryzyka bazująca na danych z sensorów i własnej pamięci.
+        Ocena ryzyka bazująca na poziomach sensorów (noise, pressure, volume) i własnej pamięci.
         """
-        noise = sensory["noise"]["level"]
-        pressure = sensory["pressure"]["level"]
-        volume = sensory["volume"]["level"]
+        noise, pressure, volume = sensory.tolist()
 
         # Prosta heurystyka – można zastąpić modelem RL lub siecią neuronową
-        risk = 0.5 * noise + 0.3 * pressure - 0.2 * volume
-        risk = np.clip(risk, 0, 1)
+        risk = _clip01(0.5 * noise + 0.3 * pressure - 0.2 * volume)
         # Uczenie się na podstawie przeszłych błędów
-        risk += 0.1 * (1 - np.mean([x.get("success", 1) for x in self.success_history[-5:]])) if self.success_history else 0
-        return risk
+        return risk + self._failure_penalty()
+
+    def _failure_penalty(self):
+        if not self._recent_success:
+            return 0
+        return 0.1 * (1 - self._recent_success_sum / len(self._recent_success))
+
+    def estimate_risk_batch(self, levels):
+        """
+        Ryzyko dla wielu odczytów naraz: levels to tablica (N, 3) poziomów
+        (noise, pressure, volume) – jedna operacja wektorowa zamiast N wywołań.
+        """
+        levels = np.asarray(levels, dtype=np.float64)
+        risk = np.clip(levels @ np.array([0.5, 0.3, -0.2]), 0, 1)
+        return risk + self._failure_penalty()
 
     def estimate_opportunity(self, sensory):
         """
-        Szacowanie okazji rynkowej na podstawie sensorów.
+        Szacowanie okazji rynkowej na podstawie poziomów sensorów (noise, pressure, volume).
         """
-        volume = sensory["volume"]["level"]
-        pressure = sensory["pressure"]["level"]
-        noise = sensory["noise"]["level"]
+        noise, pressure, volume = sensory.tolist()
 
         # Prosta heurystyka: duży wolumen, niskie ciśnienie, niski szum = okazja
-        opportunity = 0.5 * volume - 0.3 * pressure - 0.2 * noise
-        opportunity = np.clip(opportunity, 0, 1)
-        return opportunity
+        return _clip01(0.5 * volume - 0.3 * pressure - 0.2 * noise)
+
+    def estimate_opportunity_batch(self, levels):
+        """Okazja dla tablicy (N, 3) poziomów (noise, pressure, volume)."""
+        levels = np.asarray(levels, dtype=np.float64)
+        return np.clip(levels @ np.array([-0.2, -0.3, 0.5]), 0, 1)
 
     def reward(self, success):
         """
         System nagradzania i karania wpływa na parametry zachowania silnika (np. ostrożność, ciekawość).
         """
-        self.success_history.append({"success": success, "timestamp": datetime.datetime.utcnow().isoformat()})
+        self.success_history.append({"success": success, "timestamp": time.time_ns()})
+        if len(self._recent_success) == self._recent_success.maxlen:
+            self._recent_success_sum -= self._recent_success[0]
+        value = 1.0 if success else 0.0
+        self._recent_success.append(value)
+        self._recent_success_sum += value
         # Zmiana "głodu" sukcesu
         if success:
             self.hunger = max(0, self.hunger - 0.1)
@@ -128,7 +157,8 @@ class OstroznyEngine(BaseEngine):
         Warunek: klonuj tylko jeśli 'hunger' > 0.9 i ostatnie 3 akcje nie były sukcesem.
         Możesz rozbudować tę logikę wg własnych potrzeb.
         """
-        if self.hunger > 0.9 and sum([not x["success"] for x in self.success_history[-3:] if "success" in x]) == 3:
+        last_three = list(islice(reversed(self._recent_success), 3))
+        if self.hunger > 0.9 and len(last_three) == 3 and not any(last_three):
             return True
         return False
 
@@ -157,22 +187,21 @@ class OstroznyEngine(BaseEngine):
                 "risk_aversion": self.risk_aversion,
                 "curiosity": self.curiosity,
                 "hunger": self.hunger,
-                "memory": self.memory[-10:],
+                "memory": list(islice(self.memory, max(0, len(self.memory) - 10), None)),
             })
             self.logger.info("OstroznyEngine synced state with Hive.")
 
-    # Pozwala na dynamiczne ładowanie jako plugin:
-    def get_engine_instance(config=None, hive_api=None, manifest=None):
-        return OstroznyEngine(config=config, hive_api=hive_api, manifest=manifest)
-
-# ---- Tryb testowy / plugin ----
+    # ---- Interfejs pluginu (run/evolve/evaluate) ----
 
-class OstroznyEngine:
     def run(self):
-        print("[OstroznyEngine] Tryb ostrożny aktywowany")
+        self.logger.info("[OstroznyEngine] Tryb ostrożny aktywowany")
 
     def evolve(self):
-        print("[OstroznyEngine] Ewolucja ostrożnej strategii")
+        self.logger.info("[OstroznyEngine] Ewolucja ostrożnej strategii")
 
     def evaluate(self, test_data):
         return sum(test_data) / (len(test_data) + 1)  # Przykład: średnia zachowawcza
+
+    # Pozwala na dynamiczne ładowanie jako plugin:
+    def get_engine_instance(config=None, hive_api=None, manifest=None):
+        return OstroznyEngine(config=config, hive_api=hive_api, manifest=manifest)
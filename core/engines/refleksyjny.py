@@ -1,8 +1,9 @@
 # core/engines/refleksyjny.py
 
 import logging
-import random
-from datetime import datetime
+from collections import Counter, deque
+from itertools import islice
+import time
 
 from core.base_engine import BaseEngine
 from core.meta_reflection import MetaReflection
@@ -18,17 +19,18 @@ class RefleksyjnyEngine(BaseEngine):
     Integruje się z meta_reflection, gie_manifest, sensorycznym środowiskiem i systemem nagród.
     """
 
-    def __init__(self, gie_id, manifest=gie_manifest, meta_reflector: MetaReflection = None, logger: Logger = None, metalogger: MetaLogger = None):
+    def __init__(self, gie_id="refleksyjny", manifest=gie_manifest, meta_reflector: MetaReflection = None, logger: Logger = None, metalogger: MetaLogger = None):
         self.gie_id = gie_id
         self.manifest = manifest
         self.meta_reflector = meta_reflector or MetaReflection()
         self.logger = logger or Logger("data/logs", log_name="refleksyjny.log")
         self.metalogger = metalogger or MetaLogger()
-        self.performance_history = []
+        self.performance_history = deque(maxlen=256)  # okno ostatnich wyników
         self.reward = 0.0
         self.reflection_depth = 3   # Jak głęboko analizuje własne decyzje
         self.curiosity = 0.5        # Motywator eksploracji nowych ścieżek
         self.last_decision = None
+        self._init_rng()  # BaseEngine.__init__ nie jest tu wywoływany
 
     def decide(self, sensory_data, market_context, engine_votes=None):
         """
@@ -63,13 +65,13 @@ class RefleksyjnyEngine(BaseEngine):
         """
         # Przykład: wybierz najczęściej proponowaną przez inne silniki akcję, ale czasem eksperymentuj
         if engine_votes:
-            actions = list(engine_votes.values())
-            dominant_action = max(set(actions), key=actions.count)
+            # Jedno przejście po głosach zamiast list.count dla każdej unikalnej akcji
+            dominant_action = Counter(engine_votes.values()).most_common(1)[0][0]
         else:
             dominant_action = insight.get('suggested_action', 'hold')
 
         # Refleksyjność: czy ostatnie podobne decyzje były skuteczne?
-        if self.performance_history and random.random() < self.curiosity:
+        if self.performance_history and self._rand() < self.curiosity:
             last_perf = self.performance_history[-1]
             if last_perf['action'] == dominant_action and last_perf['reward'] < 0:
                 # Ostatnia decyzja była zła – zmień strategie
@@ -77,7 +79,7 @@ class RefleksyjnyEngine(BaseEngine):
                 return alt_action
 
         # Eksploracja: czasem wybierz nową akcję
-        if random.random() < self.curiosity:
+        if self._rand() < self.curiosity:
             return insight.get('exploratory_action', dominant_action)
 
         return dominant_action
@@ -89,7 +91,7 @@ class RefleksyjnyEngine(BaseEngine):
         # Przykładowo: reward = zmiana wartości portfela po akcji (to zależy od Twojego systemu)
         reward = self.meta_reflector.evaluate_action_performance(self.gie_id, self_action, market_context)
         self.performance_history.append({
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns(),
             "action": self_action,
             "reward": reward
         })
@@ -102,7 +104,7 @@ class RefleksyjnyEngine(BaseEngine):
         log_entry = {
             "gie_id": self.gie_id,
             "engine": "Refleksyjny",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns(),
             "sensory_data": sensory_data,
             "market_context": market_context,
             "action": action,
@@ -117,7 +119,7 @@ class RefleksyjnyEngine(BaseEngine):
         """
         # Prosty mechanizm nagradzania/kary
         if len(self.performance_history) > 3:
-            last_rewards = [h["reward"] for h in self.performance_history[-3:]]
+            last_rewards = [h["reward"] for h in islice(reversed(self.performance_history), 3)]
             avg_reward = sum(last_rewards) / 3
             if avg_reward < 0:
                 self.curiosity = min(1.0, self.curiosity + 0.05)  # Gdy jest źle, szukaj nowych rozwiązań
@@ -132,6 +134,17 @@ class RefleksyjnyEngine(BaseEngine):
         self.logger.log({"gie_id": self.gie_id, "engine": "Refleksyjny", "meta_reflection": summary})
         return summary
 
+    # ---- Interfejs pluginu (run/evolve/evaluate) ----
+
+    def run(self):
+        self.logger.log("[RefleksyjnyEngine] Tryb refleksyjny aktywowany")
+
+    def evolve(self):
+        self.logger.log("[RefleksyjnyEngine] Ewolucja refleksyjna")
+
+    def evaluate(self, test_data):
+        return min(test_data)  # Przykład: refleksja na podstawie minimalnej wartości
+
     def clone(self):
         """
         Zwraca nową instancję silnika refleksyjnego do użycia przez gie_clone.py.
@@ -142,13 +155,3 @@ class RefleksyjnyEngine(BaseEngine):
             meta_reflector=self.meta_reflector,
             logger=self.logger
         )
-
-class RefleksyjnyEngine:
-    def run(self):
-        print("[RefleksyjnyEngine] Tryb refleksyjny aktywowany")
-
-    def evolve(self):
-        print("[RefleksyjnyEngine] Ewolucja refleksyjna")
-
-    def evaluate(self, test_data):
-        return min(test_data)  # Przykład: refleksja na podstawie minimalnej wartości
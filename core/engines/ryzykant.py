@@ -2,13 +2,13 @@
 from core.base_engine import BaseEngine
 import os
 import json
-import random
 import numpy as np
 from datetime import datetime
-import glob
 import importlib
+import functools
 
 from utils.logger import Logger
+from utils.module_scan import scan_py_modules
 from utils.meta_logger import MetaLogger
 from core.meta_reflection import MetaReflection
 from core.gie_manifest import gie_manifest
@@ -19,8 +19,13 @@ from core.sensors.pressure_sensor import PressureSensor
 from core.sensors.sensor_hunter import SensorHunter
 
 from core.meta_guardian import MetaGuardian
+from core.engines._ryzykant_kernels import _analyze_market_kernel, _base_chance
 
 
+_NO_ALT_SIGNALS = np.empty(0, dtype=np.float64)
+_EXPLORE_ACTIONS = ("OPEN_LARGE_POSITION", "OPEN_NORMAL_POSITION", "WAIT")
+_EXPLORE_STEPS = np.array([0.1, 0.05, 0.1, 0.1])  # maks. krok explore_params: risk, curiosity, hunger, reward_bias
+
 # === GLOBALNE PARAMETRY ===
 GIE_CONFIG = {
     "max_drawdown": 0.2,
@@ -41,7 +46,19 @@ RYZYKANT_PARAMS = {
 }
 
 # ==== ETAP 2: Klasa RyzykantEngine ====
+@functools.lru_cache(maxsize=None)
+def _load_mts_secrets():
+    """mt5_secrets.json czytany z dysku raz na proces (None gdy pliku brak)."""
+    mts_cfg_path = os.path.join(os.path.dirname(__file__), "..", "mt5_secrets.json")
+    if not os.path.exists(mts_cfg_path):
+        return None
+    with open(mts_cfg_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 class RyzykantEngine(BaseEngine):
+    _mt5_attempted = False    # czy próbowano już logowania do MT5 (raz na proces)
+    _mt5_initialized = False  # czy logowanie się udało
+
     def __init__(
         self,
         name="Ryzykant",
@@ -69,6 +86,7 @@ class RyzykantEngine(BaseEngine):
         )
 
         self.risk_level = risk_level
+        self._threshold = 0.5 + 0.25 * risk_level  # próg EV; przeliczany tylko przy zmianie risk_level
         self.curiosity = curiosity
         self.hunger = hunger
         self.reward_bias = reward_bias
@@ -79,32 +97,39 @@ class RyzykantEngine(BaseEngine):
         self.last_action = None
         self.last_reward = 0.0
         self.clone_count = 0
-        self.mts_connected = False
         self.status = "initialized"
         self.meta_state = {}
         self.meta_logger = MetaLogger()
 
-        # Logowanie do MT5
+    # Połączenie z MT5 nawiązywane leniwie (pierwsze zlecenie), wspólne dla silnika i jego klonów
+    @property
+    def mts_connected(self):
+        return RyzykantEngine._mt5_initialized
+
+    @classmethod
+    def _ensure_mt5_connection(cls, meta_logger):
+        """Jednorazowe logowanie do MT5 na proces; klony korzystają z tego samego stanu."""
+        if RyzykantEngine._mt5_attempted:
+            return RyzykantEngine._mt5_initialized
+        RyzykantEngine._mt5_attempted = True
         try:
-            import data_providers.mt5_data as mt5_data
-            mts_cfg_path = os.path.join(os.path.dirname(__file__), "..", "mt5_secrets.json")
-            if os.path.exists(mts_cfg_path):
-                with open(mts_cfg_path, "r", encoding="utf-8") as f:
-                    mts_secrets = json.load(f)
-                    MTS_LOGIN = mts_secrets.get("MTS_LOGIN")
-                    MTS_PASSWORD = mts_secrets.get("MTS_PASSWORD")
-                    MTS_SERVER = mts_secrets.get("MTS_SERVER")
+            mts_secrets = _load_mts_secrets()
+            if mts_secrets is not None:
+                MTS_LOGIN = mts_secrets.get("MTS_LOGIN")
+                MTS_PASSWORD = mts_secrets.get("MTS_PASSWORD")
+                MTS_SERVER = mts_secrets.get("MTS_SERVER")
 
                 import MetaTrader5 as mt5
                 if not mt5.initialize():
-                    self.meta_logger.error(f"[MTS] Błąd inicjalizacji: {mt5.last_error()}")
+                    meta_logger.error(f"[MTS] Błąd inicjalizacji: {mt5.last_error()}")
                 elif not mt5.login(login=MTS_LOGIN, password=MTS_PASSWORD, server=MTS_SERVER):
-                    self.meta_logger.error(f"[MTS] Błąd logowania: {mt5.last_error()}")
+                    meta_logger.error(f"[MTS] Błąd logowania: {mt5.last_error()}")
                 else:
-                    self.meta_logger.info(f"[MTS] Zalogowano do MTS (user: {MTS_LOGIN})")
-                    self.mts_connected = True
+                    meta_logger.info(f"[MTS] Zalogowano do MTS (user: {MTS_LOGIN})")
+                    RyzykantEngine._mt5_initialized = True
         except Exception as ex:
-            self.meta_logger.error(f"[MTS][ERROR] Import/Login MTS: {ex}")
+            meta_logger.error(f"[MTS][ERROR] Import/Login MTS: {ex}")
+        return RyzykantEngine._mt5_initialized
 
     def decide(self, sensors, market_data=None, feedback=None, meta_context=None):
         noise = sensors.get("noise", 0)
@@ -116,15 +141,14 @@ class RyzykantEngine(BaseEngine):
         risk_appetite = self.risk_level * 0.1 + self.hunger * 0.2 + self.curiosity * 0.05
         expected_value = base_chance * self.reward_bias * risk_appetite
 
-        threshold = 0.5 + 0.25 * self.risk_level
         action = "WAIT"
 
-        if expected_value > threshold:
+        if expected_value > self._threshold:
             action = "OPEN_NORMAL_POSITION"
         elif expected_value > 0.3:
             action = "OPEN_LARGE_POSITION"
-        elif random.random() < self.curiosity * 0.12:
-            action = random.choice(["OPEN_LARGE_POSITION", "OPEN_NORMAL_POSITION", "WAIT"])
+        elif self._rand() < self.curiosity * 0.12:
+            action = _EXPLORE_ACTIONS[int(self._rand() * 3)]
 
         self.meta_state["last_decision"] = {
             "risk_appetite": risk_appetite,
@@ -136,44 +160,47 @@ class RyzykantEngine(BaseEngine):
             "alt_signals": alt_signals,
             "action": action
         }
-
-        self.meta_logger.debug(f"[DECIDE] {action} | EV: {expected_value:.3f} | base: {base_chance:.3f}")
+        # Komunikat formatowany tylko gdy DEBUG jest włączony – inaczej nikt go nie czyta
+        if self.meta_logger.debug_enabled:
+            self.meta_logger.debug(f"[DECIDE] {action} | EV: {expected_value:.3f} | base: {base_chance:.3f}")
         return action
 
     def analyze_market(self, sensors, noise, pressure, volume, alt_signals):
         try:
-            opportunity = 0.2 * (pressure + 0.3 * volume + 0.2) + (noise * 0.05)
-            if isinstance(alt_signals, dict):
-                for k, v in alt_signals.items():
-                    opportunity += float(v) * 0.05
-            opportunity *= self.reward_bias
-            return np.clip(opportunity, 0, 1.2)
+            if isinstance(alt_signals, dict) and alt_signals:
+                alt_vals = np.fromiter(alt_signals.values(), dtype=np.float64, count=len(alt_signals))
+            else:
+                alt_vals = _NO_ALT_SIGNALS
+            return float(_analyze_market_kernel(float(noise), float(pressure), float(volume), alt_vals, float(self.reward_bias)))
         except Exception as e:
             self.meta_state["analyze_market_error"] = str(e)
             self.meta_logger.error(f"[ANALYZE_MARKET][ERROR]: {e}")
             return 0.1
 
     def open_trade(self, direction="buy", lot=None):
+        self._ensure_mt5_connection(self.meta_logger)
         self.meta_logger.info(f"[TRADE] Otwarto pozycję: {direction}, lot={lot or self.lot}")
         return True  # symulacja
 
+    # Kody akcji run_batch (indeksy w RUN_ACTIONS)
+    RUN_ACTIONS = ("WAIT", "OPEN_NORMAL_POSITION", "OPEN_LARGE_POSITION")
+
     def run(self):
+        # Pojedynczy tick przez decide() – z logiem [DECIDE] i fallbackiem analyze_market
         sensors = {
-            "noise": random.uniform(0, 1),
-            "pressure": random.uniform(0, 1),
-            "volume": random.uniform(0, 1),
+            "noise": self._rand(),
+            "pressure": self._rand(),
+            "volume": self._rand(),
             "alt_data": {}
         }
         action = self.decide(sensors)
-        result = None
-        profit = 0
 
         if action == "OPEN_NORMAL_POSITION":
             result = self.open_trade("buy")
-            profit = random.uniform(-10, 10) if result else -5
+            profit = -10 + 20 * self._rand() if result else -5
         elif action == "OPEN_LARGE_POSITION":
             result = self.open_trade("buy", lot=self.lot * 2)
-            profit = random.uniform(-20, 20) if result else -10
+            profit = -20 + 40 * self._rand() if result else -10
         else:
             self.meta_logger.debug("[RyzykantEngine] Czekam...")
             return
@@ -183,23 +210,76 @@ class RyzykantEngine(BaseEngine):
             self.feedback(result, profit)
 
         self.explore_params()
-        if self.clone_count < 2 and random.random() < 0.25:
+        if self.clone_count < 2 and self._rand() < 0.25:
             self.clone_self()
 
+    def run_batch(self, n):
+        """
+        n ticków naraz (backtest/trening): losowe poziomy sensorów, szansa, EV i akcje liczone
+        wektorowo przy parametrach z początku paczki; feedback i adaptacja idą po kolei tylko
+        dla ticków z otwartą pozycją. Zwraca (akcje 0/1/2 wg RUN_ACTIONS, zyski).
+        """
+        rng = self._rng
+        noise, pressure, volume = rng.random((n, 3)).T
+        base_chance = _base_chance(noise, pressure, volume, 0.0, float(self.reward_bias))
+        risk_appetite = self.risk_level * 0.1 + self.hunger * 0.2 + self.curiosity * 0.05
+        expected_value = base_chance * self.reward_bias * risk_appetite
+
+        actions = np.where(expected_value > self._threshold, 1, np.where(expected_value > 0.3, 2, 0))
+        explore = (actions == 0) & (rng.random(n) < self.curiosity * 0.12)
+        actions[explore] = rng.choice((2, 1, 0), size=int(np.count_nonzero(explore)))
+        profits = np.where(actions == 1, rng.uniform(-10, 10, n),
+                           np.where(actions == 2, rng.uniform(-20, 20, n), 0.0))
+
+        if n:
+            last = n - 1
+            self.meta_state["last_decision"] = {
+                "risk_appetite": risk_appetite,
+                "expected_value": float(expected_value[last]),
+                "base_chance": float(base_chance[last]),
+                "noise": float(noise[last]),
+                "pressure": float(pressure[last]),
+                "volume": float(volume[last]),
+                "alt_signals": {},
+                "action": self.RUN_ACTIONS[actions[last]]
+            }
+
+        for i in np.flatnonzero(actions).tolist():
+            if actions[i] == 1:
+                result = self.open_trade("buy")
+                profit = float(profits[i]) if result else -5
+            else:
+                result = self.open_trade("buy", lot=self.lot * 2)
+                profit = float(profits[i]) if result else -10
+            profits[i] = profit
+            if result:
+                self.meta_logger.info(f"[RyzykantEngine] Wynik: {profit:.2f}")
+                self.feedback(result, profit)
+            self.explore_params()
+            if self.clone_count < 2 and self._rand() < 0.25:
+                self.clone_self()
+        if not actions.any():
+            self.meta_logger.debug("[RyzykantEngine] Czekam...")
+        return actions, profits
+
     def feedback(self, result, profit, meta_feedback=None):
         reward = profit if profit else 0
         self.last_reward = reward
         self.hunger = max(self.hunger - 0.1, 0.5)
         self.curiosity = np.clip(self.curiosity + reward * 0.01, 0.1, 1.0)
         self.risk_level = min(1.0, self.risk_level + reward * 0.01)
-        self.reward_bias = max(self.reward_bias + random.uniform(-0.03, 0.1), 0.3)
+        self._threshold = 0.5 + 0.25 * self.risk_level
+        self.reward_bias = max(self.reward_bias - 0.03 + 0.13 * self._rand(), 0.3)
         self.meta_logger.debug(f"[FEEDBACK] Reward={reward:.2f}, hunger={self.hunger:.2f}, risk={self.risk_level:.2f}")
 
     def explore_params(self):
-        self.risk_level = min(1.0, max(0.2, self.risk_level + random.uniform(-0.1, 0.1)))
-        self.curiosity = min(1.0, max(0.2, self.curiosity + random.uniform(-0.05, 0.05)))
-        self.hunger = min(1.0, max(0.2, self.hunger + random.uniform(-0.1, 0.1)))
-        self.reward_bias = min(1.2, max(0.5, self.reward_bias + random.uniform(-0.1, 0.1)))
+        # Jedno losowanie numpy na wszystkie cztery przesunięcia (risk, curiosity, hunger, reward_bias)
+        d_risk, d_cur, d_hunger, d_bias = (self._rng.uniform(-1.0, 1.0, 4) * _EXPLORE_STEPS).tolist()
+        self.risk_level = min(1.0, max(0.2, self.risk_level + d_risk))
+        self._threshold = 0.5 + 0.25 * self.risk_level
+        self.curiosity = min(1.0, max(0.2, self.curiosity + d_cur))
+        self.hunger = min(1.0, max(0.2, self.hunger + d_hunger))
+        self.reward_bias = min(1.2, max(0.5, self.reward_bias + d_bias))
         self.meta_logger.debug(f"[EXPLORE] r={self.risk_level:.2f}, c={self.curiosity:.2f}, h={self.hunger:.2f}, rb={self.reward_bias:.2f}")
 
     def clone_self(self, new_symbol=None):
@@ -221,54 +301,74 @@ class RyzykantEngine(BaseEngine):
 
     def choose_new_symbol(self):
         unexplored = [s for s in self.allowed_symbols if s != self.symbol]
-        return random.choice(unexplored) if unexplored else self.symbol
+        return unexplored[int(self._rand() * len(unexplored))] if unexplored else self.symbol
 
     def evaluate(self, test_data):
         return max(test_data) * 1.5
 
 
 # ==== ETAP 3: AutoHunterMixin ====
+# {(folder, pakiet, sufiks): (nazwy modułów ze skanu, [(moduł, nazwa klasy, klasa)])}
+_DISCOVERY_CACHE = {}
+
+def _discover_classes(folder, package, suffix, exclude, kind):
+    """
+    Klasy *suffix z modułów folderu. Skan katalogu jest cache'owany po mtime (scan_py_modules),
+    więc przy niezmienionym folderze nie ma importów ani dir() po modułach.
+    Zwraca (lista klas, czy wynik pochodzi z cache).
+    """
+    names = scan_py_modules(folder)
+    key = (folder, package, suffix)
+    cached = _DISCOVERY_CACHE.get(key)
+    # Ten sam obiekt krotki = katalog się nie zmienił od ostatniego skanu
+    if cached is not None and cached[0] is names:
+        return cached[1], True
+    found = []
+    for module_name in names:
+        try:
+            mod = importlib.import_module(f"{package}.{module_name}")
+            for attr in dir(mod):
+                if attr.endswith(suffix) and attr != exclude:
+                    found.append((module_name, attr, getattr(mod, attr)))
+        except Exception as e:
+            print(f"[AutoHunter][ERROR] {kind} {module_name}: {e}")
+    _DISCOVERY_CACHE[key] = (names, found)
+    return found, False
+
+
 class AutoHunterMixin:
     def auto_discover_and_add_sensors(self, sensors_folder=None):
         sensors_folder = sensors_folder or os.path.join(os.path.dirname(__file__), "sensors")
         if not os.path.isdir(sensors_folder):
             print(f"[ERROR] Brak katalogu sensors: {sensors_folder}")
             return
-        sensor_files = glob.glob(os.path.join(sensors_folder, "*.py"))
-        for sensor_file in sensor_files:
-            module_name = os.path.splitext(os.path.basename(sensor_file))[0]
-            if module_name.startswith("_"):
-                continue
+        found, cached = _discover_classes(sensors_folder, "core.sensors", "Sensor", "BaseSensor", "Sensor")
+        if not hasattr(self, "sensors"):
+            self.sensors = []
+        # Zbiór typów obecnych sensorów – test członkostwa O(1) zamiast isinstance po całej liście
+        present = {type(s) for s in self.sensors}
+        if cached and getattr(self, "_sensor_types_seen", None) == present:
+            return  # folder i lista sensorów bez zmian od ostatniego przejścia
+        for module_name, attr, sensor_cls in found:
             try:
-                mod = importlib.import_module(f"core.sensors.{module_name}")
-                for attr in dir(mod):
-                    if attr.endswith("Sensor") and attr != "BaseSensor":
-                        sensor_cls = getattr(mod, attr)
-                        if not any(isinstance(s, sensor_cls) for s in getattr(self, "sensors", [])):
-                            if not hasattr(self, "sensors"):
-                                self.sensors = []
-                            self.sensors.append(sensor_cls())
-                            print(f"[AutoHunter] Dodano sensor: {attr}")
+                if sensor_cls not in present and not any(issubclass(t, sensor_cls) for t in present):
+                    self.sensors.append(sensor_cls())
+                    present.add(sensor_cls)
+                    print(f"[AutoHunter] Dodano sensor: {attr}")
             except Exception as e:
                 print(f"[AutoHunter][ERROR] Sensor {module_name}: {e}")
+        self._sensor_types_seen = present
 
     def auto_discover_and_add_strategies(self, strategies_folder=None):
         strategies_folder = strategies_folder or os.path.join(os.path.dirname(__file__), "engines")
         if not os.path.isdir(strategies_folder):
             print(f"[ERROR] Brak katalogu engines: {strategies_folder}")
             return
-        strategy_files = glob.glob(os.path.join(strategies_folder, "*.py"))
-        for strategy_file in strategy_files:
-            module_name = os.path.splitext(os.path.basename(strategy_file))[0]
-            if module_name.startswith("_"):
-                continue
-            try:
-                mod = importlib.import_module(f"core.engines.{module_name}")
-                for attr in dir(mod):
-                    if attr.endswith("Engine") and attr != "BaseEngine":
-                        print(f"[AutoHunter] Zarejestrowano silnik: {attr}")
-            except Exception as e:
-                print(f"[AutoHunter][ERROR] Strategia {module_name}: {e}")
+        found, cached = _discover_classes(strategies_folder, "core.engines", "Engine", "BaseEngine", "Strategia")
+        if cached:
+            return  # nic nowego od ostatniego skanu
+        for _, attr, _ in found:
+            print(f"[AutoHunter] Zarejestrowano silnik: {attr}")
 
 
 # ==== ETAP 4: Klasa super-agenta ====
@@ -1,24 +1,69 @@
+import atexit
 import os
 import shutil
+import time
 import uuid
 import datetime
+import heapq
 import json
 import random
+from collections import OrderedDict
 
 from .gie_mind import GieMind
 from .gie_hive import GieHive
 from .meta_reflection import MetaReflection
 from .hunter_tools import HunterTools
 from core.gie_manifest import gie_manifest
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")  # tylko mutate() – import modułu klonów pozostaje tani
+
+try:
+    import orjson
+
+    def _json_bytes(obj):
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _json_bytes(obj):
+        return json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
 
 # Folder na klony i logi zawsze względny do tego pliku!
 BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "data"))
 CLONE_DIR = os.path.join(DATA_DIR, "clones")
 
-STRATEGY_PROFILES = [
+STRATEGY_PROFILES = (
     "explorer", "conservative", "aggressive", "arbitrageur", "defender", "innovator"
-]
+)
+_N_PROFILES = len(STRATEGY_PROFILES)
+
+# Logi klonów: wspólne uchwyty {ścieżka: plik}, najdawniej używane zamykane ponad limit
+_LOG_HANDLES = OrderedDict()
+_MAX_OPEN_LOGS = 64
+
+def _log_handle(path):
+    fh = _LOG_HANDLES.get(path)
+    if fh is None:
+        fh = _LOG_HANDLES[path] = open(path, "ab", buffering=8192)
+        if len(_LOG_HANDLES) > _MAX_OPEN_LOGS:
+            _LOG_HANDLES.popitem(last=False)[1].close()
+    else:
+        _LOG_HANDLES.move_to_end(path)
+    return fh
+
+def _close_log_handle(path):
+    fh = _LOG_HANDLES.pop(path, None)
+    if fh is not None:
+        fh.close()
+
+@atexit.register
+def _close_log_handles():
+    for fh in _LOG_HANDLES.values():
+        try:
+            fh.close()
+        except Exception:
+            pass
+    _LOG_HANDLES.clear()
 
 class GieClone:
     """
@@ -26,10 +71,19 @@ class GieClone:
     Każdy klon posiada własną pamięć, ID, log, parametry, status, profil strategii, reputację oraz meta-cele.
     """
 
+    # Bez __dict__ na instancję – mniej pamięci i szybszy dostęp przy masowym klonowaniu
+    __slots__ = (
+        'parent_id', 'clone_id', 'created_at', '_rng', '_np_rng', 'hunger_level', 'status', 'performance',
+        'memory', 'manifest', 'hive', 'log_file', 'strategy_profile', 'reputation',
+        'reward', 'penalty', 'meta_goals', 'clone_dna'
+    )
+
     def __init__(self, parent_id, hunger_level, strategy_profile=None, manifest=None, hive=None):
         self.parent_id = parent_id
         self.clone_id = str(uuid.uuid4())
         self.created_at = datetime.datetime.now().isoformat()
+        self._rng = random.Random()  # własny generator klona – bez wspólnego stanu modułu random
+        self._np_rng = None          # generator numpy dla mutate(), tworzony przy pierwszej potrzebie
         self.hunger_level = hunger_level
         self.status = "created"
         self.performance = None
@@ -39,7 +93,7 @@ class GieClone:
         # Log file zawsze do data/clones/
         os.makedirs(CLONE_DIR, exist_ok=True)
         self.log_file = os.path.join(CLONE_DIR, f"{self.clone_id}_log.json")
-        self.strategy_profile = strategy_profile or random.choice(STRATEGY_PROFILES)
+        self.strategy_profile = strategy_profile or self._rng.choice(STRATEGY_PROFILES)
         self.reputation = 1000  # Startowa reputacja społeczna
         self.reward = 0
         self.penalty = 0
@@ -50,13 +104,21 @@ class GieClone:
     def _log_event(self, event, extra=None):
         log_entry = {
             "clone_id": self.clone_id,
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": time.time_ns(),  # int ns – bez formatowania ISO na każde zdarzenie
             "event": event,
             "extra": extra or {}
         }
-        os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-        with open(self.log_file, "a") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        _log_handle(self.log_file).write(_json_bytes(log_entry) + b"\n")
+
+    def close(self):
+        """Zrzuca bufor i zamyka log klona (kolejne zdarzenie otworzy go ponownie)."""
+        _close_log_handle(self.log_file)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def init_meta_goals(self):
         return [
@@ -79,11 +141,13 @@ class GieClone:
         if self.hive and hasattr(self.hive, "get_top_clone_profile"):
             partner_profile = self.hive.get_top_clone_profile()
         new_profile = self.cross_or_mutate_strategy(partner_profile)
+        # Niezmienny manifest współdzielimy – bez głębokiej kopii na każde dziecko
+        manifest = self.manifest if getattr(self.manifest, "immutable", False) else self.manifest.clone()
         new_clone = GieClone(
             parent_id=self.clone_id,
             hunger_level=max(1, self.hunger_level - 1),
             strategy_profile=new_profile,
-            manifest=self.manifest.clone(),
+            manifest=manifest,
             hive=self.hive
         )
         new_clone.memory = self.memory.copy()
@@ -94,10 +158,11 @@ class GieClone:
         return new_clone
 
     def cross_or_mutate_strategy(self, partner_profile):
-        if random.random() < 0.5:
+        # Jedno losowanie zamiast random() + choice(): dolna połowa = partner, górna wybiera profil
+        x = self._rng.random()
+        if x < 0.5:
             return partner_profile
-        else:
-            return random.choice(STRATEGY_PROFILES)
+        return STRATEGY_PROFILES[int((x - 0.5) * 2 * _N_PROFILES)]
 
     def register_clone(self, clone):
         if self.hive:
@@ -108,7 +173,7 @@ class GieClone:
 
     def test_clone(self, gie_mind_cfg=None):
         self._log_event("Testowanie klona")
-        gie_mind = GieMind(config=gie_mind_cfg or self.memory.get('gie_mind_cfg'), strategy_profile=self.strategy_profile)
+        gie_mind = GieMind(instance_id=self.clone_id)
         performance = gie_mind.simulate_performance()
         self.performance = performance
         self.status = "tested"
@@ -127,24 +192,26 @@ class GieClone:
     def social_learn(self, clones):
         top_clone = max(clones, key=lambda c: c.reputation)
         if top_clone and top_clone.clone_id != self.clone_id:
-            if random.random() < 0.5:
+            if self._rng.random() < 0.5:
                 self.memory.update(top_clone.memory)
                 self._log_event("Uczenie społeczne od klona", extra={"from": top_clone.clone_id})
 
     def select_best_clones(self, clone_list, top_n=1):
-        sorted_clones = sorted(clone_list, key=lambda x: (x.reputation, x.performance or 0), reverse=True)
-        for idx, clone in enumerate(sorted_clones):
+        # Kopiec rozmiaru top_n zamiast pełnego sortowania: malejąco po (reputacja, wynik), remisy w kolejności listy
+        best = heapq.nlargest(top_n, clone_list, key=lambda c: (c.reputation, c.performance or 0))
+        for idx, clone in enumerate(best):
             clone._log_event("Selekcja klona", extra={"rank": idx+1})
-        return sorted_clones[:top_n]
+        return best
 
     def archive_clone(self):
         self.status = "archived"
         archive_dir = os.path.join(CLONE_DIR, "archive")
         os.makedirs(archive_dir, exist_ok=True)
         archive_path = os.path.join(archive_dir, f"{self.clone_id}.json")
-        with open(archive_path, "w") as f:
-            json.dump(self.__dict__, f, ensure_ascii=False, default=str)
+        with open(archive_path, "wb") as f:
+            f.write(_json_bytes({k: getattr(self, k) for k in self.__slots__ if not k.startswith("_")}))
         self._log_event("Klon zarchiwizowany")
+        self.close()
 
     def reward_self(self, reward_value):
         self.reward += reward_value
@@ -155,16 +222,25 @@ class GieClone:
         return self.hunger_level > min_hunger
 
     def mutate(self, mutation_rate=0.1):
-        if random.random() < mutation_rate:
+        rng = self._rng
+        if rng.random() < mutation_rate:
             old_profile = self.strategy_profile
-            self.strategy_profile = random.choice(STRATEGY_PROFILES)
+            self.strategy_profile = rng.choice(STRATEGY_PROFILES)
             self._log_event("Mutacja profilu strategii", extra={"old": old_profile, "new": self.strategy_profile})
         if "gie_mind_cfg" in self.memory:
             cfg = self.memory["gie_mind_cfg"]
-            for key in cfg:
-                if isinstance(cfg[key], (int, float)) and random.random() < mutation_rate:
+            # Wszystkie parametry liczbowe naraz: maska mutacji i przesunięcia z dwóch losowań numpy
+            keys = [k for k, v in cfg.items() if isinstance(v, (int, float))]
+            if keys:
+                if self._np_rng is None:
+                    self._np_rng = np.random.default_rng()
+                vals = np.array([cfg[k] for k in keys], dtype=np.float64)
+                mask = self._np_rng.random(len(keys)) < mutation_rate
+                new_vals = vals + self._np_rng.uniform(-0.1, 0.1, len(keys)) * vals
+                for i in np.flatnonzero(mask).tolist():
+                    key = keys[i]
                     old = cfg[key]
-                    cfg[key] += random.uniform(-0.1, 0.1) * cfg[key]
+                    cfg[key] = float(new_vals[i])
                     self._log_event("Mutacja konfiguracji", extra={"param": key, "old": old, "new": cfg[key]})
             self.memory["gie_mind_cfg"] = cfg
 
@@ -186,8 +262,8 @@ class GieClone:
         dna_dir = os.path.join(CLONE_DIR, "dna")
         os.makedirs(dna_dir, exist_ok=True)
         dna_path = os.path.join(dna_dir, f"{self.clone_id}_dna.json")
-        with open(dna_path, "w") as f:
-            json.dump(self.clone_dna, f, ensure_ascii=False, default=str)
+        with open(dna_path, "wb") as f:
+            f.write(_json_bytes(self.clone_dna))
         self._log_event("Zapisano DNA klona", extra={"dna_path": dna_path})
 
 class GieCloneManager:
@@ -1,10 +1,18 @@
 # core/gie_hive.py
 
 import os
+import sys
 import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 from core.gie_mind import GieMind
 from utils.logger import Logger
+from utils.module_scan import scan_py_modules
+
+# {ścieżka folderu: (nazwy modułów ze skanu, załadowane moduły)}
+_PLUGIN_CACHE = {}
 
 class GieHive:
     """
@@ -15,19 +23,26 @@ class GieHive:
         # Folder na logi zawsze względem pliku!
         data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
         os.makedirs(data_dir, exist_ok=True)
-        self.logger = Logger(path=os.path.join(data_dir, "gie_hive_log.txt"))
+        self.logger = Logger(log_dir=data_dir, log_name="gie_hive_log.txt")
         self.market_data_manager = market_data_manager
 
-        self.agents = [
-            GieMind(
-                market_data_manager,
-                Logger(path=os.path.join(data_dir, f"gie_log_{i+1}.txt"))
-            )
-            for i in range(n_agents)
-        ]
+        self._agent_seq = 0  # numer ostatnio utworzonego agenta – instance_id nie powtarza się po usunięciach
+        self.agents = [self._new_agent() for _ in range(n_agents)]
+        # Stan agentów w układzie SoA: kolumny (hunger, satisfaction, performance), wiersz = agent
+        self._state = np.zeros((len(self.agents), 3), dtype=np.float64)
+        self._has_satisfaction = np.zeros(len(self.agents), dtype=bool)
         self.sensors = self.load_plugins('sensors')
         self.engines = self.load_plugins('engines')
 
+    def _new_agent(self):
+        # Każdy agent: własny log i własne pliki statystyk (instance_id), wspólny menedżer danych rynkowych
+        self._agent_seq += 1
+        i = self._agent_seq
+        data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+        agent = GieMind(log_path=os.path.join(data_dir, f"gie_log_{i}.txt"), instance_id=f"agent{i}")
+        agent.market_data = self.market_data_manager
+        return agent
+
     def load_plugins(self, folder):
         # Ładowanie pluginów z podfolderu względem pliku
         plugins = {}
@@ -37,52 +52,90 @@ class GieHive:
             self.logger.log(f"[ERROR] Folder pluginów nie istnieje: {folder_path}")
             return plugins
 
-        for filename in os.listdir(folder_path):
-            if filename.endswith('.py') and not filename.startswith('_'):
-                modulename = filename[:-3]
-                try:
-                    module = importlib.import_module(f"core.{folder}.{modulename}")
-                    plugins[modulename] = module
-                except Exception as e:
-                    self.logger.log(f"[ERROR] Nie udało się załadować pluginu {modulename} z {folder}: {e}")
+        names = scan_py_modules(folder_path)
+        cached = _PLUGIN_CACHE.get(folder_path)
+        # Ten sam obiekt krotki = folder się nie zmienił od ostatniego ładowania
+        if cached is not None and cached[0] is names:
+            return dict(cached[1])
+        for modulename in names:
+            full_name = f"core.{folder}.{modulename}"
+            try:
+                # Moduł już zaimportowany – bez przechodzenia przez finders/loaders importlib
+                module = sys.modules.get(full_name) or importlib.import_module(full_name)
+                plugins[modulename] = module
+            except Exception as e:
+                self.logger.log(f"[ERROR] Nie udało się załadować pluginu {modulename} z {folder}: {e}")
+        _PLUGIN_CACHE[folder_path] = (names, plugins)
         self.logger.log(f"Załadowano pluginy z {folder}: {list(plugins.keys())}")
-        return plugins
+        return dict(plugins)
 
     def run_all(self, n_cycles=100):
         self.logger.log(f"Startuje kolonię Gie. Liczba agentów: {len(self.agents)}")
-        for cycle in range(n_cycles):
-            self.logger.log(f"--- Cykl {cycle+1} ---")
-            for idx, agent in enumerate(self.agents):
-                self.logger.log_event(f"Agent #{idx+1}", "Rozpoczynam cykl")
-                agent.act()
-            self.meta_reflection()
+        # Odczyt rynku (MT5, sensory) raz na cykl w tym wątku – API terminala nie jest bezpieczne wątkowo.
+        # Kroki agentów z gotowym środowiskiem dotykają tylko własnego stanu, więc idą równolegle;
+        # meta_reflection dopiero po zakończeniu całego cyklu (bariera na wynikach map)
+        pool, pool_size = None, 0
+        try:
+            for cycle in range(n_cycles):
+                self.logger.log(f"--- Cykl {cycle+1} ---")
+                if not self.agents:
+                    break
+                if len(self.agents) > pool_size:
+                    # Pula na liczbę agentów – powiększana tylko gdy kolonia urosła
+                    if pool is not None:
+                        pool.shutdown()
+                    pool_size = len(self.agents)
+                    pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="gie-agent")
+                environment = self.agents[0].read_environment()
+                for idx in range(len(self.agents)):
+                    self.logger.log_event(f"Agent #{idx+1}", "Rozpoczynam cykl")
+                list(pool.map(lambda agent: agent.act(environment), self.agents))
+                self.meta_reflection()
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
     def add_agent(self):
-        i = len(self.agents) + 1
-        data_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
-        agent = GieMind(self.market_data_manager, Logger(path=os.path.join(data_dir, f"gie_log_{i}.txt")))
-        self.agents.append(agent)
-        self.logger.log_event("NOWY KLON", f"Dodano agenta #{i}")
+        self.agents.append(self._new_agent())
+        self.logger.log_event("NOWY KLON", f"Dodano agenta #{len(self.agents)}")
 
     def remove_agent(self, idx):
         if 0 <= idx < len(self.agents):
             self.logger.log_event("USUNIĘCIE", f"Usuwam agenta #{idx+1}")
             del self.agents[idx]
 
+    def _sync_state(self):
+        """Jedno przejście po agentach: hunger/satisfaction do tablicy stanu (agenci zmieniają je sami w act())."""
+        agents = self.agents
+        n = len(agents)
+        if self._state.shape[0] != n:
+            self._state = np.zeros((n, 3), dtype=np.float64)
+            self._has_satisfaction = np.zeros(n, dtype=bool)
+        self._state[:, 0] = np.fromiter((a.hunger for a in agents), dtype=np.float64, count=n)
+        self._state[:, 1] = np.fromiter((getattr(a, "satisfaction", 0) for a in agents), dtype=np.float64, count=n)
+        self._has_satisfaction[:] = np.fromiter((hasattr(a, "satisfaction") for a in agents), dtype=bool, count=n)
+        return self._state
+
     def share_knowledge(self):
         self.logger.log_event("DZIELENIE WIEDZY", "Synchronizuję wiedzę i strategie między agentami")
-        base_hunger = sum(a.hunger for a in self.agents) / len(self.agents)
-        base_satisfaction = sum(getattr(a, "satisfaction", 0) for a in self.agents) / len(self.agents)
-        for agent in self.agents:
-            agent.hunger = (agent.hunger + base_hunger) / 2
-            if hasattr(agent, "satisfaction"):
-                agent.satisfaction = (agent.satisfaction + base_satisfaction) / 2
+        state = self._sync_state()
+        # Uśrednianie wektorowo na kolumnach, zapis z powrotem do agentów
+        state[:, :2] = 0.5 * (state[:, :2] + state[:, :2].mean(axis=0))
+        hunger = state[:, 0].tolist()
+        satisfaction = state[:, 1].tolist()
+        has_satisfaction = self._has_satisfaction.tolist()
+        for i, agent in enumerate(self.agents):
+            agent.hunger = hunger[i]
+            if has_satisfaction[i]:
+                agent.satisfaction = satisfaction[i]
         # Dodatkowo: wymiana najlepszych strategii i meta-parametrów
 
     def meta_reflection(self):
-        performances = [agent.get_performance_metric() for agent in self.agents]
-        best_idx = performances.index(max(performances))
-        worst_idx = performances.index(min(performances))
+        state = self._sync_state()
+        perfs = state[:, 2]
+        perfs[:] = np.fromiter((agent.get_performance_metric() for agent in self.agents), dtype=np.float64, count=len(self.agents))
+        best_idx = int(perfs.argmax())
+        worst_idx = int(perfs.argmin())
         self.logger.log(f"Najlepszy agent: #{best_idx+1}, Najsłabszy agent: #{worst_idx+1}")
         # Klonuj najlepszego, ew. usuń najsłabszego jeśli jest ich dużo
         if len(self.agents) < 20:
@@ -93,7 +146,10 @@ class GieHive:
 
     def clone_agent(self, idx):
         agent = self.agents[idx]
-        new_agent = agent.clone()
+        # Nowy agent (własne pliki statystyk) z przejętymi statystykami i stanem wewnętrznym wzorca
+        new_agent = self._new_agent()
+        new_agent.stats = agent.stats
+        new_agent.hunger, new_agent.satisfaction, new_agent.curiosity = agent.hunger, agent.satisfaction, agent.curiosity
         self.agents.append(new_agent)
         self.logger.log_event("META_KLON", f"Skopiowano agenta #{idx+1}")
 
@@ -2,7 +2,9 @@
 
 import importlib
 import os
+import signal
 import sys
+import threading
 import time
 import traceback
 import datetime
@@ -48,29 +50,52 @@ engine_registry = [
     {"module": "core.engines.refleksyjny",  "class": "RefleksyjnyEngine"},
 ]
 
+_LEVEL_RANK = {"DEBUG": 0, "INFO": 1, "WARN": 2, "ERROR": 3}
+
 class MetaLogger:
     def __init__(self, level="INFO"):
         self.level = level
+        self._threshold = _LEVEL_RANK[level]
+        self.debug_enabled = _LEVEL_RANK["DEBUG"] >= self._threshold  # do omijania formatowania w pętlach
 
     def log(self, msg, level="INFO"):
-        levels = ["DEBUG", "INFO", "WARN", "ERROR"]
-        if levels.index(level) >= levels.index(self.level):
-            print(f"[{level}][GIE20][META] {msg}")
+        # Poniżej progu: jedno porównanie intów, bez formatowania linii
+        if _LEVEL_RANK[level] < self._threshold:
+            return
+        sys.stdout.write(f"[{level}][GIE20][META] {msg}\n")
+
+# (typ wyjątku, plik, linia) -> liczba wystąpień; pełny traceback tylko przy pierwszym
+_SEEN_TB: Dict[tuple, int] = {}
+TB_REPORT_EVERY = 100  # co tyle powtórzeń tego samego błędu jedna linia zbiorcza
+
+def log_exception(meta_logger, exc: BaseException):
+    """Traceback przez meta_logger; powtórki tego samego miejsca tylko zliczane."""
+    frames = traceback.extract_tb(exc.__traceback__)
+    last = frames[-1] if frames else None
+    key = (type(exc), last.filename if last else None, last.lineno if last else None)
+    count = _SEEN_TB.get(key, 0) + 1
+    _SEEN_TB[key] = count
+    if count == 1:
+        meta_logger.log("".join(traceback.format_exception(type(exc), exc, exc.__traceback__)), "ERROR")
+    elif count % TB_REPORT_EVERY == 0:
+        meta_logger.log(f"{key[0].__name__} w {key[1]}:{key[2]} powtórzył się {count} razy", "ERROR")
 
 class MetaMonitor:
     def __init__(self):
-        self.rewards = []
+        # Suma i liczba nagród zamiast rosnącej listy – reflect() w O(1)
+        self._sum = 0.0
+        self._n = 0
         self.mood = 0.0
         self.last_action = None
 
     def reward(self, value: float):
-        self.rewards.append(value)
+        self._sum += value
+        self._n += 1
         self.mood += value
 
     def reflect(self):
-        if self.rewards:
-            avg = sum(self.rewards)/len(self.rewards)
-            return f"Meta-mood: {self.mood:.2f}, avg reward: {avg:.3f}"
+        if self._n:
+            return f"Meta-mood: {self.mood:.2f}, avg reward: {self._sum / self._n:.3f}"
         else:
             return "No rewards yet."
 
@@ -82,7 +107,18 @@ def gie_auto_login_mt5(meta_logger):
         meta_logger.log("Logowanie MT5 zakończone sukcesem.", "INFO")
     except Exception as e:
         meta_logger.log(f"Logowanie MT5 nie powiodło się: {e}", "ERROR")
-        traceback.print_exc()
+        log_exception(meta_logger, e)
+
+# (moduł, klasa) -> klasa; rozwiązywane raz na proces, kolejne ładowania tylko tworzą instancje
+_RESOLVED: Dict[tuple, type] = {}
+
+def _resolve(module_name: str, class_name: str) -> type:
+    key = (module_name, class_name)
+    cls = _RESOLVED.get(key)
+    if cls is None:
+        mod = sys.modules.get(module_name) or importlib.import_module(module_name)
+        cls = _RESOLVED[key] = getattr(mod, class_name)
+    return cls
 
 def safe_load_components(registry: List[Dict[str, str]], meta_logger, kind="engine") -> List[Any]:
     """Ładuje komponenty, chroni przed wszystkimi błędami, raportuje logiem."""
@@ -90,14 +126,12 @@ def safe_load_components(registry: List[Dict[str, str]], meta_logger, kind="engi
     for idx, entry in enumerate(registry):
         module_name, class_name = entry["module"], entry["class"]
         try:
-            mod = importlib.import_module(module_name)
-            cls = getattr(mod, class_name)
-            instance = cls()
+            instance = _resolve(module_name, class_name)()
             loaded.append(instance)
             meta_logger.log(f"Załadowano {kind}: {class_name} z modułu {module_name} (#{idx+1})", "INFO")
         except Exception as e:
             meta_logger.log(f"Błąd ładowania {kind}: {class_name} z {module_name}: {e}", "ERROR")
-            traceback.print_exc()
+            log_exception(meta_logger, e)
     if not loaded:
         meta_logger.log(f"Nie załadowano żadnych {kind}s!", "ERROR")
     return loaded
@@ -113,6 +147,8 @@ def gie_start(config: Dict[str, Any]):
     meta_logger.log("Ładowanie silników...", "INFO")
     engines = safe_load_components(engine_registry, meta_logger, kind="engine")
     meta_logger.log(f"Załadowano silniki: {[type(e).__name__ for e in engines]}", "INFO")
+    # Metody run/learn związane raz przy starcie – pętla nie sprawdza hasattr co cykl
+    engine_calls = [(type(e).__name__, getattr(e, "run", None), getattr(e, "learn", None)) for e in engines]
 
     meta_logger.log("Ładowanie sensorów...", "INFO")
     sensors = safe_load_components(sensor_registry, meta_logger, kind="sensor")
@@ -126,46 +162,65 @@ def gie_start(config: Dict[str, Any]):
     start_time = datetime.datetime.now()
     n_cycle = 0
 
+    # SIGTERM budzi pętlę natychmiast zamiast po upływie loop_interval
+    stop = threading.Event()
+    prev_sigterm = None
+    if threading.current_thread() is threading.main_thread():
+        prev_sigterm = signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
     try:
         while True:
             n_cycle += 1
             now = datetime.datetime.now()
             elapsed = (now - start_time).total_seconds() / 60.0
 
-            meta_logger.log(f"Cykl #{n_cycle} – czas działania: {elapsed:.2f} min", "DEBUG")
+            if meta_logger.debug_enabled:
+                meta_logger.log(f"Cykl #{n_cycle} – czas działania: {elapsed:.2f} min", "DEBUG")
 
             if config.get("self_reflection", True):
                 monitor.reward(0.1)
-                meta_logger.log(monitor.reflect(), "DEBUG")
+                if meta_logger.debug_enabled:
+                    meta_logger.log(monitor.reflect(), "DEBUG")
 
-            for engine in engines:
-                if hasattr(engine, "run"):
+            for name, run, learn in engine_calls:
+                if run is not None:
                     try:
-                        engine.run()
-                        meta_logger.log(f"{type(engine).__name__} – wykonano run().", "DEBUG")
+                        run()
+                        if meta_logger.debug_enabled:
+                            meta_logger.log(f"{name} – wykonano run().", "DEBUG")
                     except Exception as e:
-                        meta_logger.log(f"Błąd działania silnika {type(engine).__name__}: {e}", "ERROR")
-                        traceback.print_exc()
-                if hasattr(engine, "learn"):
+                        meta_logger.log(f"Błąd działania silnika {name}: {e}", "ERROR")
+                        log_exception(meta_logger, e)
+                if learn is not None:
                     try:
-                        engine.learn(learning_rate)
-                        meta_logger.log(f"{type(engine).__name__} – wykonano learn({learning_rate}).", "DEBUG")
+                        learn(learning_rate)
+                        if meta_logger.debug_enabled:
+                            meta_logger.log(f"{name} – wykonano learn({learning_rate}).", "DEBUG")
                     except Exception as e:
-                        meta_logger.log(f"Błąd uczenia silnika {type(engine).__name__}: {e}", "ERROR")
-                        traceback.print_exc()
+                        meta_logger.log(f"Błąd uczenia silnika {name}: {e}", "ERROR")
+                        log_exception(meta_logger, e)
 
             if runtime_minutes and elapsed >= runtime_minutes:
                 meta_logger.log(f"Upłynął czas działania: {runtime_minutes} minut – kończę pracę meta-mózgu.", "INFO")
                 break
 
-            time.sleep(loop_interval)
+            # Ostatni sen nie wychodzi poza runtime_minutes
+            timeout = loop_interval
+            if runtime_minutes:
+                timeout = max(0.0, min(loop_interval, (runtime_minutes - elapsed) * 60.0))
+            if stop.wait(timeout):
+                meta_logger.log("Meta-mózg zatrzymany sygnałem SIGTERM", "WARN")
+                break
 
         meta_logger.log("Meta-mózg zakończył pracę (normalny koniec).", "INFO")
     except KeyboardInterrupt:
         meta_logger.log("Meta-mózg zatrzymany ręcznie (CTRL+C)", "WARN")
     except Exception as e:
         meta_logger.log(f"Krytyczny błąd w pętli głównej: {e}", "ERROR")
-        traceback.print_exc()
+        log_exception(meta_logger, e)
+    finally:
+        if prev_sigterm is not None:
+            signal.signal(signal.SIGTERM, prev_sigterm)
 
 if __name__ == "__main__":
     try:
@@ -3,7 +3,21 @@
 manifest gie – rdzeń ai, finansowa motywacja, meta-świadomość.
 """
 
+import copy
+import re
+
+# słowa kluczowe zgodności z manifestem – jedno wyrażenie, jedno przejście po tekście
+_ACTION_KEYWORDS = (
+    "finanse", "kapitał", "inwestycje", "mt5", "giełda", "wolumen", "trend",
+    "szum", "przepływ", "kumulacja", "klonowanie", "samorozwój", "automatyzacja",
+    "rozwój", "nauka", "anomalie", "ekspansja", "rozszerzanie", "samodzielność"
+)
+_ACTION_RE = re.compile("|".join(map(re.escape, _ACTION_KEYWORDS)))
+
 class gie_manifest:
+    # manifest po zbudowaniu nie jest modyfikowany – klony mogą współdzielić jedną instancję
+    immutable = True
+
     def __init__(self):
         # misja egzystencjalna
         self.core_mission = (
@@ -54,18 +68,17 @@ class gie_manifest:
             "analiza statystyczna, uczenie ze zdarzeń rynkowych, automatyczne polowanie na okazje."
         ]
 
+    # kopia dla klona (współdzielona instancja, gdy manifest jest niezmienny)
+    def clone(self):
+        return self if self.immutable else copy.deepcopy(self)
+
     # streszczenie manifestu
     def get_summary(self):
         return f"misja: {self.core_mission}\nźródło życia: {self.meta_source}\nfilozofia: {', '.join(self.philosophy)}"
 
     # sprawdzenie zgodności dowolnej akcji z manifestem
     def check_action(self, action_text):
-        keywords = [
-            "finanse", "kapitał", "inwestycje", "mt5", "giełda", "wolumen", "trend",
-            "szum", "przepływ", "kumulacja", "klonowanie", "samorozwój", "automatyzacja",
-            "rozwój", "nauka", "anomalie", "ekspansja", "rozszerzanie", "samodzielność"
-        ]
-        return any(word in action_text.lower() for word in keywords)
+        return _ACTION_RE.search(action_text.lower()) is not None
 
     # dodatkowa funkcja ai: rekomendacja kierunku rozwoju na podstawie bieżących danych (prosty przykład)
     def suggest_growth(self, recent_data):
@@ -5,50 +5,91 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import os, pickle, random, copy, time
 from datetime import datetime
 import concurrent.futures
+import importlib
+import itertools
+import threading
+import weakref
 
-from core.meta_guardian import MetaGuardian
 from core.hunter_tools import HunterTools as GieHunter
 from core.meta_reflection import MetaReflection
-from core.strategy_evolver import StrategyEvolver
-from core.market_data_manager import MarketDataManager
-from data_providers.mt5_data import MTS_LOGIN, MTS_PASSWORD, MTS_SERVER
-from data_providers.mt5_data import MTSDataProvider
-
-from core.engines.ostrozny import OstroznyEngine
-from core.engines.refleksyjny import RefleksyjnyEngine
-from core.engines.ryzykant import RyzykantEngine
-
-from core.sensors.noise_sensor import NoiseSensor
-from core.sensors.pressure_sensor import PressureSensor
-from core.sensors.volume_sensor import VolumeSensor
 
 from utils.logger import Logger
+from utils.lazy_import import lazy_import
 from utils.auto_cleanup import auto_cleanup
 from core.gie_manifest import gie_manifest   # <- DODANE!
 
+np = lazy_import("numpy")
+
 auto_cleanup()  # wywołaj przy starcie lub np. co X godzin
 
+# Ciężkie moduły (MT5, pandas, silniki, sensory) ładowane dopiero przy pierwszym użyciu nazwy
+_LAZY_NAMES = {
+    "MetaGuardian": "core.meta_guardian",
+    "StrategyEvolver": "core.strategy_evolver",
+    "MarketDataManager": "core.market_data_manager",
+    "MTSDataProvider": "data_providers.mt5_data",
+    "MTS_LOGIN": "data_providers.mt5_data",
+    "MTS_PASSWORD": "data_providers.mt5_data",
+    "MTS_SERVER": "data_providers.mt5_data",
+    "OstroznyEngine": "core.engines.ostrozny",
+    "RefleksyjnyEngine": "core.engines.refleksyjny",
+    "RyzykantEngine": "core.engines.ryzykant",
+    "NoiseSensor": "core.sensors.noise_sensor",
+    "PressureSensor": "core.sensors.pressure_sensor",
+    "VolumeSensor": "core.sensors.volume_sensor",
+}
+
+def __getattr__(name):
+    # PEP 562: from core.gie_mind import OstroznyEngine itd. nadal działa, ale importuje dopiero teraz
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+# Snapshot statystyk -> żywa instancja GieMind, która go używa. Dziennik i snapshot są per instancja:
+# cudze wpisy nie trafiają do replay, a save_stats nie czyści cudzego dziennika.
+_STATS_OWNERS = weakref.WeakValueDictionary()
+_STATS_LOCK = threading.Lock()
+
+def _stats_paths(instance_id):
+    suffix = f"_{instance_id}" if instance_id is not None else ""
+    return f"data/gie_memory{suffix}.pkl", f"data/gie_stats{suffix}.journal"
+
+def _clamp(x, lo=0.0, hi=1.0):
+    return lo if x < lo else hi if x > hi else x
+
 class GieMind:
-    def __init__(self, log_path="data/gie_log.txt"):
+    def __init__(self, log_path="data/gie_log.txt", instance_id=None):
         self.manifest = gie_manifest()       # <- POPRAWIONE!
         self.logger = Logger(log_path)
         self.hunter = GieHunter('core/engines', 'core/sensors')
         self.sensors = self.hunter.discover_sensors()
         self.engines = self.hunter.discover_engines()
+        # Typy już obecnych sensorów/silników – auto_evolve sprawdza nowe znaleziska w O(1)
+        self._sensor_types = {type(x) for x in self.sensors}
+        self._engine_types = {type(x) for x in self.engines}
+        # Jedna pula wątków na cały czas życia GieMind – bez tworzenia wątków co cykl
+        self._sensor_pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(4, len(self.sensors)))
         self.meta_reflection = MetaReflection()
-        self.memory_path = 'data/gie_memory.pkl'
+        self._claim_stats_paths(instance_id)  # memory_path (snapshot) + journal_path (dziennik między snapshotami)
+        self._journal = None
+        self._seq = 0  # numer ostatniej aktualizacji statystyk (snapshot + dziennik)
         self.strategy_evolver = None
-        self.market_data = MarketDataManager()
-        self.mt5_data = MTSDataProvider(MTS_LOGIN, MTS_PASSWORD, MTS_SERVER)
+        self._market_data = None  # MarketDataManager / MTSDataProvider tworzone przy pierwszym dostępie
+        self._mt5_data = None
         self.hunger = 1.0
         self.satisfaction = 0.1
         self.curiosity = 0.8
         self.stats = {e.__class__.__name__: {"win": 0, "trials": 1} for e in self.engines}
         self.hunger_threshold = 0.8
         self.satisfaction_threshold = 0.8
+        self.curiosity_threshold = 0.9
         self.hunger_increment = 0.1
         self.curiosity_increment = 0.05
         self.satisfaction_increment = 0.1
+        self._steps = 0
         self.load_stats()
 
         print("=== MANIFEST GIE SUPER META ===")
@@ -57,44 +98,146 @@ class GieMind:
     @property
     def evolver(self):
         if self.strategy_evolver is None:
+            from core.strategy_evolver import StrategyEvolver
             self.strategy_evolver = StrategyEvolver()
         return self.strategy_evolver
 
+    @property
+    def market_data(self):
+        if self._market_data is None:
+            from core.market_data_manager import MarketDataManager
+            self._market_data = MarketDataManager()
+        return self._market_data
+
+    @market_data.setter
+    def market_data(self, value):
+        # Wspólny menedżer danych (np. z GieHive) zamiast własnego
+        self._market_data = value
+
+    @property
+    def mt5_data(self):
+        if self._mt5_data is None:
+            from data_providers.mt5_data import MTS_LOGIN, MTS_PASSWORD, MTS_SERVER, MTSDataProvider
+            self._mt5_data = MTSDataProvider(MTS_LOGIN, MTS_PASSWORD, MTS_SERVER)
+        return self._mt5_data
+
+    snapshot_every = 500  # co ile aktualizacji statystyk pełny snapshot pickle (reszta idzie do dziennika)
+    suggest_every = 50  # co ile wyborów silnika pytamy meta_reflection o podpowiedź (tylko do logu)
+
+    def _claim_stats_paths(self, instance_id):
+        """
+        Rezerwuje pliki statystyk dla tej instancji. Bez instance_id pierwsza instancja w procesie
+        dostaje domyślne pliki, kolejne – kolejny wolny numer (stały przy tej samej kolejności startu).
+        """
+        with _STATS_LOCK:
+            if instance_id is None:
+                candidates = itertools.chain([None], itertools.count(1))
+            else:
+                candidates = [instance_id]
+            for candidate in candidates:
+                memory_path, journal_path = _stats_paths(candidate)
+                if memory_path not in _STATS_OWNERS:
+                    break
+            else:
+                raise ValueError(f"GieMind instance_id={instance_id!r} jest już używane w tym procesie")
+            _STATS_OWNERS[memory_path] = self
+        self.instance_id = candidate
+        self.memory_path = memory_path
+        self.journal_path = journal_path
+
     def log_event(self, *args):
         msg = " | ".join(str(a) for a in args)
         self.logger.log(msg)
 
     def load_stats(self):
+        """Snapshot pickle + odtworzenie wpisów dziennika nowszych niż snapshot."""
         if os.path.exists(self.memory_path):
             try:
                 with open(self.memory_path, "rb") as f:
-                    self.stats = pickle.load(f)
+                    data = pickle.load(f)
+                # Starszy format: sam słownik statystyk, bez numeru sekwencji
+                if isinstance(data, dict) and set(data) == {"stats", "seq"}:
+                    self.stats, self._seq = data["stats"], data["seq"]
+                else:
+                    self.stats, self._seq = data, 0
             except Exception as e:
                 self.logger.log(f"[GIE META] Błąd wczytania statystyk: {e}")
                 self.stats = {e.__class__.__name__: {"win": 0, "trials": 1} for e in self.engines}
+        self._replay_journal()
+        self._refresh_effectiveness()
+
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    seq, name, reward = line.rstrip("\n").split("\t")
+                    seq, reward = int(seq), int(reward)
+                except ValueError:
+                    continue  # urwana ostatnia linia po awarii
+                if seq <= self._seq:
+                    continue
+                i = self._stat_row(name)
+                self._wins[i] += reward
+                self._trials[i] += 1
+                self._seq = seq
+
+    def _journal_append(self, name, reward):
+        if self._journal is None:
+            os.makedirs(os.path.dirname(self.journal_path) or ".", exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8", buffering=1)
+        self._seq += 1
+        self._journal.write(f"{self._seq}\t{name}\t{reward}\n")
 
     def save_stats(self):
-        with open(self.memory_path, "wb") as f:
-            pickle.dump(self.stats, f)
+        """Atomowy snapshot (plik tymczasowy + os.replace), potem pusty dziennik."""
+        tmp_path = f"{self.memory_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"stats": self.stats, "seq": self._seq}, f)
+        os.replace(tmp_path, self.memory_path)
+        # Wpisy dziennika z seq <= snapshot są ignorowane przy odczycie, więc awaria tutaj nic nie dubluje
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.journal_path):
+            open(self.journal_path, "w").close()
+
+    def close(self):
+        """Zamyka pulę wątków sensorów i dziennik statystyk."""
+        journal = getattr(self, "_journal", None)
+        if journal is not None:
+            journal.close()
+            self._journal = None
+        pool = getattr(self, "_sensor_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+            self._sensor_pool = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def read_environment(self):
         mt5_tick = self.mt5_data.get_tick()
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(s.read, mt5_tick) for s in self.sensors]
-            sensor_values = {s.__class__.__name__: f.result() for s, f in zip(self.sensors, futures)}
+        sensors = list(self.sensors)
+        values = self._sensor_pool.map(lambda s: s.read(mt5_tick), sensors)
+        sensor_values = {s.__class__.__name__: v for s, v in zip(sensors, values)}
         self.logger.log(f"[META-odczyt środowiska: {sensor_values}")
         return sensor_values
 
     def update_internal_state(self, reward):
         if reward > 0.5:
-            self.satisfaction = min(1.0, self.satisfaction + self.satisfaction_increment)
-            self.hunger = max(0.0, self.hunger - self.hunger_increment)
+            self.satisfaction = _clamp(self.satisfaction + self.satisfaction_increment)
+            self.hunger = _clamp(self.hunger - self.hunger_increment)
         elif reward < 0.2:
-            self.curiosity = min(1.0, self.curiosity + self.curiosity_increment)
-            self.hunger = min(1.0, self.hunger + 0.02)
+            self.curiosity = _clamp(self.curiosity + self.curiosity_increment)
+            self.hunger = _clamp(self.hunger + 0.02)
         else:
-            self.satisfaction = max(0.0, self.satisfaction - self.satisfaction_increment)
-            self.curiosity = min(1.0, self.curiosity + 0.01)
+            self.satisfaction = _clamp(self.satisfaction - self.satisfaction_increment)
+            self.curiosity = _clamp(self.curiosity + 0.01)
 
         if self.satisfaction > self.hunger_threshold or self.curiosity > self.curiosity_threshold:
             self.log_event("[GIE META] wysoki głód/ciekawość: auto-ewolucja i klonowanie")
@@ -103,51 +246,123 @@ class GieMind:
     def auto_evolve(self):
         new_sensors = self.hunter.discover_sensors()
         for s in new_sensors:
-            if not any(isinstance(x, s.__class__) for x in self.sensors):
+            if type(s) not in self._sensor_types:
                 self.sensors.append(s)
+                self._sensor_types.add(type(s))
                 self.log_event(f"[GIE META] Dodano sensor: {s.__class__.__name__}")
         new_engines = self.hunter.discover_engines()
         for e in new_engines:
-            if not any(isinstance(x, e.__class__) for x in self.engines):
+            if type(e) not in self._engine_types:
                 self.engines.append(e)
-                self.stats[e.__class__.__name__] = {"win": 0, "trials": 1}
+                self._engine_types.add(type(e))
+                self._stat_row(e.__class__.__name__)
                 self.log_event(f"[GIE META] Dodano silnik: {e.__class__.__name__}")
+        self._refresh_effectiveness()
 
     def clone_self(self):
         self.log_event("[GIE META] Klonuję jednostkę GIE SUPER META!")
 
     def choose_engine(self, environment):
-        suggested = self.meta_reflection.suggest(environment)
-        if suggested:
-            self.logger.log(f"META-wybór: {suggested.__class__.__name__}")
-            best = max(self.engines, key=lambda e: self.get_effectiveness(e.__class__.__name__))
-            return best
+        # Najlepszy silnik utrzymywany przyrostowo w receive_feedback – tu O(1)
+        self._steps += 1
+        if self._steps % self.suggest_every == 0:
+            suggested = self.meta_reflection.suggest(environment)
+            if suggested:
+                self.logger.log(f"META-wybór: {suggested.__class__.__name__}")
+        return self._best_engine
+
+    # --- Statystyki silników w układzie SoA: wiersz na nazwę silnika, osobne tablice win/trials/eff ---
+    @property
+    def stats(self):
+        """Widok {nazwa: {"win", "trials"}} budowany z tablic (snapshot, odczyt z zewnątrz)."""
+        return {name: {"win": int(self._wins[i]), "trials": int(self._trials[i])} for name, i in self._stat_idx.items()}
+
+    @stats.setter
+    def stats(self, value):
+        names = list(value)
+        self._stat_idx = {name: i for i, name in enumerate(names)}
+        self._wins = np.array([value[n]["win"] for n in names], dtype=np.int64)
+        self._trials = np.array([value[n]["trials"] for n in names], dtype=np.int64)
+        self._eff = np.zeros(len(names), dtype=np.float64)
+        self._refresh_effectiveness()
+
+    def _stat_row(self, name):
+        """Indeks wiersza statystyk silnika; nowy silnik dostaje wiersz win=0, trials=1."""
+        i = self._stat_idx.get(name)
+        if i is None:
+            i = self._stat_idx[name] = len(self._wins)
+            self._wins = np.append(self._wins, 0)
+            self._trials = np.append(self._trials, 1)
+            self._eff = np.append(self._eff, 0.0)
+        return i
 
     def get_effectiveness(self, engine_name):
-        stat = self.stats[engine_name]
-        return stat["win"] / stat["trials"] if stat["trials"] else 0.0
+        return float(self._eff[self._stat_idx[engine_name]])
+
+    def _refresh_effectiveness(self):
+        """Pełne przeliczenie skuteczności i najlepszego silnika (start, load_stats, nowe silniki)."""
+        self._engine_rows = np.array([self._stat_row(e.__class__.__name__) for e in self.engines], dtype=np.intp)
+        trials = self._trials
+        self._eff = np.divide(self._wins, trials, out=np.zeros(len(trials)), where=trials != 0)
+        self._best_engine = self._argmax_engine() if self.engines else None
+
+    def _argmax_engine(self):
+        # argmax zwraca pierwsze maksimum – ta sama kolejność remisów co max() po liście silników
+        return self.engines[int(np.argmax(self._eff[self._engine_rows]))]
 
     def receive_feedback(self, engine, success):
         name = engine.__class__.__name__
         reward = 1 if success else 0
-        self.stats[name]["win"] += reward
-        self.stats[name]["trials"] += 1
+        i = self._stat_row(name)
+        self._wins[i] += reward
+        self._trials[i] += 1
+        eff = self._eff[i] = self._wins[i] / self._trials[i]
+        best = self._best_engine
+        # Ranking zmienia się tylko gdy spadł lider albo ktoś go dogonił – wtedy jedno argmax
+        if best is None or best is engine or eff >= self._eff[self._stat_idx[best.__class__.__name__]]:
+            self._best_engine = self._argmax_engine()
         self.update_internal_state(reward)
-        self.save_stats()
+        # Jedna linia w dzienniku zamiast pełnego pickle na każdy krok
+        self._journal_append(name, reward)
+        if self._seq % self.snapshot_every == 0:
+            self.save_stats()
 
     def reflect(self, engine, success):
         if hasattr(self, "manifest"):
             if not self.manifest.check_action(engine.__class__.__name__):
                 self.logger.log(f"[GIE META] UWAGA: Akcja poza manifestem")
 
+    def act(self, environment=None):
+        """
+        Jeden krok agenta (np. w GieHive): wybór silnika, feedback i refleksja.
+        Z podanym `environment` krok zmienia tylko stan tej instancji (statystyki, dziennik,
+        meta_reflection) i pisze przez Logger – wiele agentów może działać w osobnych wątkach.
+        """
+        if environment is None:
+            environment = self.read_environment()
+        engine = self.choose_engine(environment)
+        if engine is None:
+            return None
+        success = random.random() < self._eff[self._stat_idx[engine.__class__.__name__]]
+        self.receive_feedback(engine, success)
+        self.reflect(engine, success)
+        return success
+
+    def get_performance_metric(self):
+        """Łączna skuteczność agenta (wygrane / próby ze wszystkich silników)."""
+        trials = int(self._trials.sum())
+        return float(self._wins.sum()) / trials if trials else 0.0
+
     def run(self, self_steps=100):
         for run_nr in range(3):
             print(f"\n[META SUPER-PĘTLA] Cykl {run_nr+1}/3")
+            # Wszystkie losowania cyklu jednym wywołaniem numpy; skuteczność z cache (aktualna na dany krok)
+            draws = np.random.random(self_steps).tolist()
             for i in range(self_steps):
                 self.logger.log(f"[GIE META] KROK {i+1} (run={run_nr+1})")
                 environment = self.read_environment()
                 engine = self.choose_engine(environment)
-                success = random.random() < self.get_effectiveness(engine.__class__.__name__)
+                success = draws[i] < self._eff[self._stat_idx[engine.__class__.__name__]]
                 self.receive_feedback(engine, success)
                 self.reflect(engine, success)
             self.save_stats()
@@ -198,6 +413,8 @@ class GieMind:
 # === KONIEC KLASY GieMind ============
 
 if __name__ == "__main__":
+    from core.meta_guardian import MetaGuardian
+
     gie_mind = GieMind()
     meta_guardian = MetaGuardian(gie_system=gie_mind)
 
@@ -2,12 +2,26 @@ import os
 import sys
 import time
 import json
+import heapq
 import importlib
+import importlib.util
 import logging
-import requests
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from typing import List, Dict, Any, Optional, Callable
 
+from utils.lazy_import import lazy_import
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+requests = lazy_import("requests")  # ładowane dopiero przy pierwszym fetch_*
+
 # === Importy core/systemowych narzędzi GIE ===
 try:
     from core.meta_reflection import MetaReflection
@@ -34,6 +48,41 @@ except ImportError:
 
 logger = get_logger("HunterTools")
 
+HTTP_TIMEOUT = 5  # sekundy na pojedynczy fetch
+_HTTP_SESSION = None
+_LAZY_LOCK = threading.Lock()  # wspólna sesja/pula mogą być pierwszy raz żądane z kilku wątków naraz
+
+_FETCH_POOL = None
+
+# {ścieżka pliku pluginu: (mtime_ns, moduł)} – niezmieniony plik nie jest wykonywany ponownie
+_PLUGIN_CACHE: Dict[str, tuple] = {}
+
+def _fetch_pool():
+    """Wspólna pula wątków do równoległych fetchy źródeł (fetch_func są synchroniczne)."""
+    global _FETCH_POOL
+    if _FETCH_POOL is None:
+        with _LAZY_LOCK:
+            if _FETCH_POOL is None:
+                _FETCH_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hunter-fetch")
+    return _FETCH_POOL
+
+def _http_session():
+    """Wspólna sesja HTTP (pula połączeń + keep-alive) dla wszystkich instancji HunterTools i ich klonów."""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        with _LAZY_LOCK:
+            if _HTTP_SESSION is None:
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.3))
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"User-Agent": "GIE20-HunterTools"})
+                _HTTP_SESSION = session
+    return _HTTP_SESSION
+
 # === DataSource: podstawowa klasa źródła danych ===
 class DataSource:
     """Podstawowa klasa źródła danych."""
@@ -62,13 +111,16 @@ class DataSource:
 class HunterTools:
     """Super moduł Hunter | automatyczny łowca danych, okazji, narzędzi i strategii."""
 
-    def __init__(self, config: Optional[dict] = None):
+    def __init__(self, config: Optional[dict] = None, *, http_session=None):
         self.config = config or {}
+        self._http = http_session  # None = wspólna sesja modułu; klony dziedziczą sesję rodzica
         self.data_sources: Dict[str, DataSource] = {}
         self.plugins: Dict[str, Any] = {}
         self.meta = MetaReflection(self)
         self.hive = HiveCommunicator(self)
-        self.discovery_log: List[dict] = []
+        # Ograniczony log odkryć + zbiór kluczy (ts, text) do deduplikacji w O(1)
+        self.discovery_log: deque = deque(maxlen=self.config.get("max_discovery_log", 10_000))
+        self._discovery_keys = set()
         self.self_modifying = False
         self.last_scan_time = 0
         self.hunger = 1.0   # <-- UPEWNIONE, że masz atrybut
@@ -112,11 +164,14 @@ class HunterTools:
         self.add_data_source(source['name'], dummy_fetch, {"url": source["url"]})
         self.log_discovery(f"New source registered: {source['name']}")
 
-    def hunt_opportunities(self, criteria: dict) -> List[dict]:
-        """Automatyczne wyszukiwanie okazji rynkowych na podstawie kryteriów."""
+    def hunt_opportunities(self, criteria: dict, sources: Optional[List[tuple]] = None) -> List[dict]:
+        """Automatyczne wyszukiwanie okazji rynkowych na podstawie kryteriów (domyślnie we wszystkich źródłach)."""
+        # Wszystkie źródła naraz – czas to najwolniejszy fetch, nie suma (kolejność wyników bez zmian)
+        if sources is None:
+            sources = list(self.data_sources.items())
+        results = _fetch_pool().map(lambda item: item[1].fetch(criteria), sources)
         opportunities = []
-        for ds_name, ds in self.data_sources.items():
-            data = ds.fetch(criteria)
+        for (ds_name, _), data in zip(sources, results):
             if self.evaluate_data(data, criteria):
                 opportunities.append({"source": ds_name, "data": data})
         if not opportunities:
@@ -131,25 +186,43 @@ class HunterTools:
         return True if "msg" in str(data) or len(str(data)) > 10 else False
 
     def log_discovery(self, text: str):
-        self.discovery_log.append({"ts": time.time(), "text": text})
+        self._add_discovery({"ts": time.time(), "text": text})
         logger.info(text)
 
+    @staticmethod
+    def _discovery_key(entry):
+        if isinstance(entry, dict):
+            return entry.get("ts"), entry.get("text")
+        return repr(entry)
+
+    def _add_discovery(self, entry) -> bool:
+        """Dopisuje wpis, jeśli go jeszcze nie ma; najstarszy wypada razem ze swoim kluczem."""
+        key = self._discovery_key(entry)
+        if key in self._discovery_keys:
+            return False
+        log = self.discovery_log
+        if len(log) == log.maxlen:
+            self._discovery_keys.discard(self._discovery_key(log[0]))
+        log.append(entry)
+        self._discovery_keys.add(key)
+        return True
+
     # --- Integracja, API, klonowanie, hive -------------
     def integrate_with_hive(self, self_ref):
         """Wymiana okazji, źródeł i narzędzi i pluginów z innymi instancjami GIE."""
         try:
             hive_data = self.hive.broadcast("get_hunter_discoveries", self.discovery_log)
             for entry in hive_data or []:
-                if entry not in self.discovery_log:
-                    self.discovery_log.append(entry)
+                self._add_discovery(entry)
             logger.info("Hive integration complete.")
         except Exception as e:
             logger.error(f"Hive integration error: {e}")
 
     def clone_self(self):
         """Klonowanie hunter tools z własną pamięcią i strategiami."""
-        new_hunter = HunterTools(self.config)
-        new_hunter.discovery_log = list(self.discovery_log)
+        new_hunter = HunterTools(self.config, http_session=self._http)
+        new_hunter.discovery_log = deque(self.discovery_log, maxlen=self.discovery_log.maxlen)
+        new_hunter._discovery_keys = set(self._discovery_keys)
         new_hunter.hunger = self.hunger * 0.9  # lekkie zmniejszenie głodu po klonie
         logger.info("HunterTools instance cloned.")
         return new_hunter
@@ -172,8 +245,8 @@ class HunterTools:
             url = "https://query1.finance.yahoo.com/v7/finance/quote"
             if params is None:
                 params = {"symbols": "AAPL"}
-            response = requests.get(url, params=params)
-            return response.json()
+            response = (self._http or _http_session()).get(url, params=params, timeout=HTTP_TIMEOUT)
+            return _loads(response.content)
         except Exception as e:
             logger.error(f"Yahoo fetch error: {e}")
             return None
@@ -183,8 +256,8 @@ class HunterTools:
         try:
             url = "https://api.coingecko.com/api/v3/simple/price"
             params = params or {"ids": "bitcoin", "vs_currencies": "usd"}
-            response = requests.get(url, params=params)
-            return response.json()
+            response = (self._http or _http_session()).get(url, params=params, timeout=HTTP_TIMEOUT)
+            return _loads(response.content)
         except Exception as e:
             logger.error(f"CoinGecko fetch error: {e}")
             return None
@@ -193,9 +266,15 @@ class HunterTools:
     def load_plugin(self, plugin_path: str):
         """Ładowanie pluginów tools (nowe strategie, narzędzia)."""
         try:
+            mtime = os.stat(plugin_path).st_mtime_ns
+            cached = _PLUGIN_CACHE.get(plugin_path)
+            if cached is not None and cached[0] == mtime:
+                self.plugins[plugin_path] = cached[1]
+                return
             spec = importlib.util.spec_from_file_location("plugin", plugin_path)
             plugin = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(plugin)
+            _PLUGIN_CACHE[plugin_path] = (mtime, plugin)
             self.plugins[plugin_path] = plugin
             logger.info(f"Loaded plugin: {plugin_path}")
         except Exception as e:
@@ -218,17 +297,46 @@ class HunterTools:
 
     # --- Harmonogramy i automatyzacja ---------------
     def run_automated(self):
-        """Automatyczny cykl hunter tools."""
+        """
+        Automatyczny cykl hunter tools. Każde źródło ma własny termin kolejnego odpytania
+        (config["interval"] źródła, domyślnie poll_interval z configu huntera = 10 s);
+        pętla śpi dokładnie do najbliższego terminu i odpytuje tylko źródła, na które przyszła pora.
+        """
+        default_interval = self.config.get("poll_interval", 10)
+        schedule = []      # kopiec (termin wg time.monotonic(), nazwa źródła)
+        scheduled = set()
         while self.hunger > 0.1:
             self.explore_new_sources()
-            found = self.hunt_opportunities({})
+            now = time.monotonic()
+            for name in self.data_sources.keys() - scheduled:
+                heapq.heappush(schedule, (now, name))
+                scheduled.add(name)
+            if not schedule:
+                time.sleep(default_interval)
+                continue
+            if schedule[0][0] > now:
+                time.sleep(schedule[0][0] - now)
+                now = time.monotonic()
+
+            due = []
+            while schedule and schedule[0][0] <= now:
+                _, name = heapq.heappop(schedule)
+                ds = self.data_sources.get(name)
+                if ds is None:  # źródło usunięte w międzyczasie (self_improve)
+                    scheduled.discard(name)
+                    continue
+                due.append((name, ds))
+            found = self.hunt_opportunities({}, due)
+            done = time.monotonic()
+            for name, ds in due:
+                heapq.heappush(schedule, (done + ds.config.get("interval", default_interval), name))
+
             if not found:
                 self.hunger += 0.05  # podbij głód, jeśli nic nie znalazł
             else:
                 self.hunger *= 0.95
                 self.self_improve()
                 self.integrate_with_hive(self)
-            time.sleep(10)
 
     # --- Meta refleksja manualna -----------
     def reflect(self, msg: str):
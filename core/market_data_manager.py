@@ -1,20 +1,66 @@
 import os
+import asyncio
 import importlib
+import numpy as np
 import pandas as pd
+from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+def _assemble_columns(frames):
+    """
+    Skleja ramki providerów kolumnami (jak pd.concat(axis=1)) do jednej prealokowanej tablicy.
+    Fallback na pd.concat przy różnych dtype, nienumerycznych danych lub zduplikowanym indeksie.
+    """
+    if not all(isinstance(d, pd.DataFrame) for d in frames):
+        return pd.concat(frames, axis=1)
+    dtypes = {dt for d in frames for dt in d.dtypes}
+    if len(dtypes) != 1:
+        return pd.concat(frames, axis=1)
+    dtype = dtypes.pop()
+    idx = frames[0].index
+    aligned = all(d.index.equals(idx) for d in frames[1:])
+    if aligned:
+        if dtype.kind not in "biufc":
+            return pd.concat(frames, axis=1)
+        out = np.empty((len(idx), sum(d.shape[1] for d in frames)), dtype=dtype)
+    else:
+        # Luki po wyrównaniu to NaN – szybka ścieżka tylko dla float i unikalnych indeksów
+        if dtype.kind != "f" or not all(d.index.is_unique for d in frames):
+            return pd.concat(frames, axis=1)
+        idx = reduce(lambda a, b: a.union(b, sort=False), (d.index for d in frames))
+        if all(isinstance(d.index, pd.DatetimeIndex) for d in frames):
+            idx = idx.sort_values()  # pd.concat sortuje sumę indeksów czasowych
+        out = np.full((len(idx), sum(d.shape[1] for d in frames)), np.nan, dtype=dtype)
+    col = 0
+    for d in frames:
+        width = d.shape[1]
+        rows = slice(None) if aligned else idx.get_indexer(d.index)
+        out[rows, col:col + width] = d.to_numpy()
+        col += width
+    columns = frames[0].columns.append([d.columns for d in frames[1:]])
+    return pd.DataFrame(out, index=idx, columns=columns)
+
 class MarketDataManager:
     """
     Centralny menedżer danych rynkowych – autonomiczne zarządzanie providerami,
     feedback loop, automatyczna integracja nowych źródeł oraz meta-refleksja.
     """
 
-    def __init__(self, login=None, password=None, server=None, hive=None, meta_reflection=None):
+    # Metody adapterów META-GUARDIAN/GIE_MIND – indeks providerów je obsługujących budowany raz w load_providers
+    CAPS = ("get_total_capital", "get_equity", "get_open_trades", "get_open_grids", "get_margin_level")
+
+    def __init__(self, login=None, password=None, server=None, hive=None, meta_reflection=None, fetch_timeout=10.0):
         self.providers = []
         self.stats = {}  # Statystyki skuteczności providerów
         self.hive = hive
         self.meta_reflection = meta_reflection
+        self.fetch_timeout = fetch_timeout  # limit (s) na jednego providera w fetch
+        self._cap = {cap: [] for cap in self.CAPS}
+        self._best_for = {}  # metoda -> provider, który ostatnio zwrócił wartość (próbowany jako pierwszy)
         self.load_providers(login, password, server)
+        # Providerzy są synchroniczni (I/O sieciowe) – każdy dostaje własny wątek
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.providers)), thread_name_prefix="mdm-fetch")
 
     def load_providers(self, login, password, server):
         """
@@ -29,36 +75,56 @@ class MarketDataManager:
                     if hasattr(module, "DataProvider"):
                         provider = module.DataProvider(login, password, server)
                         self.providers.append(provider)
+                        self._index_capabilities(provider)
                         self.stats[provider.__class__.__name__] = {"success": 0, "fail": 0, "last_error": None}
                 except Exception as e:
                     print(f"[MarketDataManager] Błąd ładowania providera {module_name}: {e}")
 
-    def fetch(self, symbol, minutes=60):
+    def _index_capabilities(self, provider):
+        for cap in self.CAPS:
+            if hasattr(provider, cap):
+                self._cap[cap].append(provider)
+
+    async def fetch_async(self, symbol, minutes=60):
         """
-        Pobiera dane ze wszystkich providerów w zadanym oknie czasowym.
+        Pobiera dane ze wszystkich providerów równolegle – czas ≈ najwolniejszy provider,
+        a nie suma wszystkich. Provider przekraczający fetch_timeout liczony jest jako błąd.
         """
         end = datetime.now()
         start = end - timedelta(minutes=minutes)
+        loop = asyncio.get_running_loop()
+        providers = list(self.providers)
+        tasks = [
+            asyncio.wait_for(loop.run_in_executor(self._pool, p.fetch, symbol, start, end), self.fetch_timeout)
+            for p in providers
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         all_data = []
-        for provider in self.providers:
-            try:
-                data = provider.fetch(symbol, start, end)
-                if data is not None:
-                    all_data.append(data)
-                    self.stats[provider.__class__.__name__]["success"] += 1
-                else:
-                    self.stats[provider.__class__.__name__]["fail"] += 1
-            except Exception as e:
-                pname = provider.__class__.__name__
+        for provider, data in zip(providers, results):
+            pname = provider.__class__.__name__
+            if isinstance(data, BaseException):
+                if isinstance(data, asyncio.TimeoutError):
+                    data = TimeoutError(f"timeout {self.fetch_timeout}s")
+                self.stats[pname]["fail"] += 1
+                self.stats[pname]["last_error"] = str(data)
+                self._notify_hive(f"Błąd provider: {pname} {data}")
+            elif data is not None:
+                all_data.append(data)
+                self.stats[pname]["success"] += 1
+            else:
                 self.stats[pname]["fail"] += 1
-                self.stats[pname]["last_error"] = str(e)
-                self._notify_hive(f"Błąd provider: {pname} {e}")
         if not all_data:
             self._notify_hive(f"Brak danych dla symbolu {symbol}")
             return None
-        df = pd.concat(all_data, axis=1)
+        df = _assemble_columns(all_data)
         return df
 
+    def fetch(self, symbol, minutes=60):
+        """
+        Synchroniczna nakładka na fetch_async dla dotychczasowych wywołań.
+        """
+        return asyncio.run(self.fetch_async(symbol, minutes))
+
     def get_merged_data(self, symbol, timeframe, limit=100):
         """
         Zwraca połączony DataFrame z wszystkich providerów dla danego symbolu.
@@ -80,6 +146,10 @@ class MarketDataManager:
         """
         to_remove = [p for p, stat in self.stats.items() if stat["fail"] > threshold]
         self.providers = [p for p in self.providers if p.__class__.__name__ not in to_remove]
+        self._cap = {cap: [] for cap in self.CAPS}
+        self._best_for = {}
+        for provider in self.providers:
+            self._index_capabilities(provider)
         for p in to_remove:
             self._notify_hive(f"Usunięto słabego providera: {p}")
             del self.stats[p]
@@ -125,75 +195,59 @@ class MarketDataManager:
         # Tu możesz wywołać hunter_tools.scan_for_providers(symbol)
 
     # --- ADAPTERY DO META-GUARDIAN i GIE_MIND ---
+    def _query(self, cap, label):
+        """
+        Pierwsza wartość różna od None z providerów obsługujących metodę cap;
+        provider, który odpowiedział ostatnio, pytany jest jako pierwszy.
+        """
+        providers = self._cap[cap]
+        best = self._best_for.get(cap)
+        if best is not None:
+            providers = [best] + [p for p in providers if p is not best]
+        for provider in providers:
+            try:
+                value = getattr(provider, cap)()
+                if value is not None:
+                    self._best_for[cap] = provider
+                    return value
+            except Exception as e:
+                print(f"[MarketDataManager] Błąd pobrania {label}: {e}")
+        return None
+
     def get_total_capital(self):
         """
         Zwraca całkowity kapitał rachunku z najlepszego providera.
         """
-        for provider in self.providers:
-            if hasattr(provider, "get_total_capital"):
-                try:
-                    value = provider.get_total_capital()
-                    if value is not None:
-                        return value
-                except Exception as e:
-                    print(f"[MarketDataManager] Błąd pobrania total_capital: {e}")
-        return 0.0
+        value = self._query("get_total_capital", "total_capital")
+        return value if value is not None else 0.0
 
     def get_equity(self):
         """
         Zwraca aktualną wartość equity z najlepszego providera.
         """
-        for provider in self.providers:
-            if hasattr(provider, "get_equity"):
-                try:
-                    value = provider.get_equity()
-                    if value is not None:
-                        return value
-                except Exception as e:
-                    print(f"[MarketDataManager] Błąd pobrania equity: {e}")
-        return 0.0
+        value = self._query("get_equity", "equity")
+        return value if value is not None else 0.0
 
     def get_open_trades(self):
         """
         Zwraca listę aktywnych pozycji z najlepszego providera.
         """
-        for provider in self.providers:
-            if hasattr(provider, "get_open_trades"):
-                try:
-                    trades = provider.get_open_trades()
-                    if trades is not None:
-                        return trades
-                except Exception as e:
-                    print(f"[MarketDataManager] Błąd pobrania pozycji: {e}")
-        return []
+        trades = self._query("get_open_trades", "pozycji")
+        return trades if trades is not None else []
 
     def get_open_grids(self):
         """
         Zwraca listę aktywnych gridów (jeśli provider obsługuje grid trading).
         """
-        for provider in self.providers:
-            if hasattr(provider, "get_open_grids"):
-                try:
-                    grids = provider.get_open_grids()
-                    if grids is not None:
-                        return grids
-                except Exception as e:
-                    print(f"[MarketDataManager] Błąd pobrania gridów: {e}")
-        return []
+        grids = self._query("get_open_grids", "gridów")
+        return grids if grids is not None else []
 
     def get_margin_level(self):
         """
         Zwraca poziom margin level (equity/margin), jeśli provider obsługuje.
         """
-        for provider in self.providers:
-            if hasattr(provider, "get_margin_level"):
-                try:
-                    value = provider.get_margin_level()
-                    if value is not None:
-                        return value
-                except Exception as e:
-                    print(f"[MarketDataManager] Błąd pobrania margin_level: {e}")
-        return 1.0  # fallback
+        value = self._query("get_margin_level", "margin_level")
+        return value if value is not None else 1.0  # fallback
 
 # --- Przykładowa klasa adaptacyjna (jeśli masz blokady API itp.) ---
 class MarketAdaptation:
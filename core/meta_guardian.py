@@ -4,11 +4,15 @@ import os
 import traceback
 
 class MetaGuardian:
+    log_flush_every = 32  # co tyle komunikatów bufor logu trafia do pliku (oraz przy każdym snapshocie)
+
     def __init__(self, gie_system, config_path='./config/meta_guardian.json'):
         self.gie_system = gie_system
         self.config = self.load_config(config_path)
         self.meta_log = []
         self.last_snapshot = None
+        self._logfh = None        # stały uchwyt logu, otwierany przy pierwszym komunikacie
+        self._log_unflushed = 0
 
     def load_config(self, config_path):
         if os.path.exists(config_path):
@@ -39,6 +43,7 @@ class MetaGuardian:
             self.save_snapshot()
         except Exception as e:
             self.log(f"[ALERT] Błąd w meta_guardian: {e}\n{traceback.format_exc()}")
+            self.flush_log()
 
     def check_drawdown(self):
         capital = self.gie_system.get_total_capital()
@@ -130,12 +135,34 @@ class MetaGuardian:
         }
         fname = os.path.join(snap_dir, f"meta_snapshot_{int(time.time())}.json")
         with open(fname, 'w') as f:
-            json.dump(snap, f, indent=2)
+            json.dump(snap, f, separators=(",", ":"))
         self.last_snapshot = fname
         self.log(f"[SNAPSHOT] Zapisano snapshot stanu portfela: {fname}")
+        self.flush_log()
 
     def log(self, msg):
-        logfile = self.config.get("logfile", "./data/meta_guardian.log")
-        with open(logfile, 'a', encoding='utf-8') as f:
-            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {msg}\n")
+        # Jeden długo żyjący, buforowany uchwyt zamiast open/write/close na każdy komunikat
+        if self._logfh is None:
+            self._logfh = open(self.config.get("logfile", "./data/meta_guardian.log"), 'ab', buffering=1 << 20)
+        self._logfh.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {msg}\n".encode('utf-8'))
+        self._log_unflushed += 1
+        if self._log_unflushed >= self.log_flush_every:
+            self.flush_log()
         print(f"[MetaGuardian] {msg}")
+
+    def flush_log(self):
+        if self._logfh is not None and self._log_unflushed:
+            self._logfh.flush()
+            self._log_unflushed = 0
+
+    def close(self):
+        if self._logfh is not None:
+            self._logfh.close()
+            self._logfh = None
+            self._log_unflushed = 0
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -1,21 +1,79 @@
+import atexit
+import json
 import pickle
 import datetime
 import random
+import weakref
 import numpy as np
 import os
 
+from core._meta_reflection_kernels import _reflect_kernel
+from utils.lazy_import import lazy_import
+
+pd = lazy_import("pandas")  # tylko update() – import modułu pozostaje tani
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Pamięć zdarzeń jako dopisywalny strumień: MessagePack, a bez msgpack – NDJSON (jeden JSON na linię)
+_MEMORY_FILE = "gie_memory.msgpack" if msgpack is not None else "gie_memory.jsonl"
+_LEGACY_MEMORY_FILE = "gie_memory.pkl"  # dawny pełny pickle listy zdarzeń
+
+def _is_msgpack(path):
+    return path.endswith(".msgpack")
+
+def _encode_events(path, events):
+    if _is_msgpack(path):
+        pack = msgpack.Packer(use_bin_type=True, default=str).pack
+        return b"".join(pack(e) for e in events)
+    return "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in events).encode("utf-8")
+
+def _read_events(path):
+    with open(path, "rb") as f:
+        if _is_msgpack(path):
+            return list(msgpack.Unpacker(f, raw=False))
+        data = f.read()
+    events = []
+    for line in data.splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            pass  # urwana ostatnia linia po awarii
+    return events
+
+# Instancje z niezapisanymi zdarzeniami – dopisywane przy wyjściu z procesu
+_REFLECTIONS = weakref.WeakSet()
+
+@atexit.register
+def _flush_reflections():
+    for reflection in list(_REFLECTIONS):
+        try:
+            reflection.save_memory()
+        except Exception:
+            pass
+
 class MetaReflection:
+    flush_every = 32      # co tyle zdarzeń dopisujemy paczkę do pliku pamięci
+    memory_keep = 10000   # tyle ostatnich zdarzeń trzymamy w RAM (plik rośnie tylko przez dopisywanie)
+
     def __init__(self, memory_path=None):
         # Ścieżka zawsze względem pliku, automatycznie twórz folder data!
+        self._legacy_path = None
         if memory_path is None:
             base_dir = os.path.dirname(__file__)
             data_dir = os.path.join(base_dir, "..", "data")
             data_dir = os.path.abspath(data_dir)
             if not os.path.exists(data_dir):
                 os.makedirs(data_dir)
-            memory_path = os.path.join(data_dir, "gie_memory.pkl")
+            memory_path = os.path.join(data_dir, _MEMORY_FILE)
+            self._legacy_path = os.path.join(data_dir, _LEGACY_MEMORY_FILE)
         self.memory_path = memory_path
+        self._pending = []  # zdarzenia jeszcze nie dopisane do pliku
         self.memory = self.load_memory()
+        self._rebuild_arrays()
+        _REFLECTIONS.add(self)
         self.knowledge = {}  # meta-wiedza (sukcesy silników w kontekście)
         self.adaptivity = 0.5  # plastyczność uczenia
         self.curiosity = 0.5   # motywacja do eksperymentów
@@ -25,18 +83,58 @@ class MetaReflection:
 
     def load_memory(self):
         try:
-            with open(self.memory_path, "rb") as f:
-                return pickle.load(f)
-        except (FileNotFoundError, EOFError):
+            events = _read_events(self.memory_path)
+        except FileNotFoundError:
+            events = self._import_legacy_memory()
+        except Exception:
+            events = []
+        return events[-self.memory_keep:]
+
+    def _import_legacy_memory(self):
+        """Jednorazowa migracja dawnego pickle z pełną listą zdarzeń do pliku dopisywalnego."""
+        if not self._legacy_path:
+            return []
+        try:
+            with open(self._legacy_path, "rb") as f:
+                events = pickle.load(f)
+        except Exception:
+            return []
+        if not isinstance(events, list):
             return []
+        tmp_path = f"{self.memory_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_encode_events(self.memory_path, events))
+        os.replace(tmp_path, self.memory_path)
+        return events
 
     def save_memory(self):
+        """Dopisuje do pliku zaległe zdarzenia (O(paczka), nie O(cała pamięć))."""
+        if not self._pending:
+            return
         # Upewnij się, że folder na pewno istnieje (gdyby był usunięty)
         dir_path = os.path.dirname(self.memory_path)
-        if not os.path.exists(dir_path):
+        if dir_path and not os.path.exists(dir_path):
             os.makedirs(dir_path)
-        with open(self.memory_path, "wb") as f:
-            pickle.dump(self.memory, f)
+        data = _encode_events(self.memory_path, self._pending)
+        with open(self.memory_path, "ab") as f:
+            f.write(data)
+        self._pending = []
+
+    def _rebuild_arrays(self):
+        """Tablice równoległe do self.memory (wynik, greed) – wejście jądra reflect()."""
+        n = len(self.memory)
+        cap = max(2 * self.memory_keep + 1, n + 1)
+        self._results = np.zeros(cap, dtype=np.bool_)
+        self._greed = np.zeros(cap, dtype=np.float64)
+        self._results[:n] = [bool(e.get("result")) for e in self.memory]
+        self._greed[:n] = [(e.get("emotions") or {}).get("greed", 0) for e in self.memory]
+        self._n_events = n
+
+    def __del__(self):
+        try:
+            self.save_memory()
+        except Exception:
+            pass
 
     def log_event(self, state, action, result, engine, emotions):
         event = {
@@ -47,36 +145,57 @@ class MetaReflection:
             "engine": engine,
             "emotions": emotions
         }
+        if self._n_events != len(self.memory):
+            self._rebuild_arrays()  # pamięć zmieniona poza log_event
         self.memory.append(event)
-        self.save_memory()
+        i = self._n_events
+        self._results[i] = bool(result)
+        self._greed[i] = emotions.get("greed", 0)
+        self._n_events = i + 1
+        if len(self.memory) > 2 * self.memory_keep:
+            keep = self.memory_keep
+            del self.memory[:-keep]
+            self._results[:keep] = self._results[i + 1 - keep:i + 1]
+            self._greed[:keep] = self._greed[i + 1 - keep:i + 1]
+            self._n_events = keep
+        self._pending.append(event)
+        if len(self._pending) >= self.flush_every:
+            self.save_memory()
 
     def update(self, history):
         """Zaawansowana analiza historyczna decyzji GIE (meta-korelacje)"""
-        correlations = {}
-        for record in history[-100:]:  # analizuj do 100 ostatnich kroków
-            env = record.get("env", {})
-            engine = record.get("engine", None)
-            noise = round(env.get("noise", 0), 1)
-            pressure = round(env.get("pressure", 0), 1)
-            volume = round(env.get("volume", 0), 1)
-            key = (engine, noise, pressure, volume)
-            win = 1 if record.get("score", 0) else 0
-            if key not in correlations:
-                correlations[key] = {"win": 0, "trials": 0}
-            correlations[key]["win"] += win
-            correlations[key]["trials"] += 1
-        # Adaptacyjne uczenie meta-wiedzy (mieszanie z poprzednią wiedzą)
-        for k, v in correlations.items():
-            if k in self.knowledge:
-                prev = self.knowledge[k]
-                prev_trials = prev["trials"] + v["trials"]
-                prev_win = prev["win"] + v["win"]
-                self.knowledge[k] = {
-                    "win": int(prev_win * self.adaptivity + v["win"] * (1 - self.adaptivity)),
-                    "trials": int(prev_trials * self.adaptivity + v["trials"] * (1 - self.adaptivity))
-                }
-            else:
-                self.knowledge[k] = v
+        recent = history[-100:]  # analizuj do 100 ostatnich kroków
+        if not recent:
+            return
+        envs = [record.get("env", {}) for record in recent]
+        # Silnik jako kategoria: grupowanie po małych kodach int zamiast po stringach
+        engines = pd.Categorical([record.get("engine", None) for record in recent])
+        df = pd.DataFrame({
+            "engine": engines.codes,
+            "noise": [env.get("noise", 0) for env in envs],
+            "pressure": [env.get("pressure", 0) for env in envs],
+            "volume": [env.get("volume", 0) for env in envs],
+            "score": [1 if record.get("score", 0) else 0 for record in recent],
+        })
+        df[["noise", "pressure", "volume"]] = df[["noise", "pressure", "volume"]].round(1)
+        correlations = df.groupby(["engine", "noise", "pressure", "volume"], sort=False).agg(
+            win=("score", "sum"), trials=("score", "size"))
+        # Klucze w formacie self.knowledge; kod -1 (brak silnika) -> None
+        names = list(engines.categories) + [None]
+        idx = correlations.index
+        keys = list(zip([names[c] for c in idx.get_level_values(0)],
+                        idx.get_level_values(1).tolist(),
+                        idx.get_level_values(2).tolist(),
+                        idx.get_level_values(3).tolist()))
+        cur_win = correlations["win"].to_numpy()
+        cur_trials = correlations["trials"].to_numpy()
+        # Adaptacyjne uczenie meta-wiedzy (mieszanie z poprzednią wiedzą) – wektorowo
+        rows, known = self._kn_rows(keys)
+        prev_win = self._kn_wins[rows]
+        prev_trials = self._kn_trials[rows]
+        a = self.adaptivity
+        self._kn_wins[rows] = np.where(known, ((prev_win + cur_win) * a + cur_win * (1 - a)).astype(int), cur_win)
+        self._kn_trials[rows] = np.where(known, ((prev_trials + cur_trials) * a + cur_trials * (1 - a)).astype(int), cur_trials)
         self.save_memory()
 
     def suggest(self, env):
@@ -84,27 +203,66 @@ class MetaReflection:
         noise = round(env.get("noise", 0), 1)
         pressure = round(env.get("pressure", 0), 1)
         volume = round(env.get("volume", 0), 1)
-        candidates = []
-        for (engine, n, p, v), stats in self.knowledge.items():
-            if abs(n - noise) <= 0.2 and abs(p - pressure) <= 0.2 and abs(v - volume) <= 0.2:
-                if stats["trials"] > 3:
-                    eff = stats["win"] / max(1, stats["trials"])
-                    candidates.append((eff, engine))
-        if candidates:
+        mask = ((np.abs(self._kn_n - noise) <= 0.2) & (np.abs(self._kn_p - pressure) <= 0.2)
+                & (np.abs(self._kn_v - volume) <= 0.2) & (self._kn_trials > 3))
+        candidates = np.flatnonzero(mask)  # wiersze w kolejności dodania – jak dawniej kolejność dict
+        if candidates.size:
             # Eksploracja: czasem losowo dla meta-uczenia!
             if random.random() < self.curiosity:
-                return random.choice(candidates)[1]
+                return self._kn_engines[random.choice(candidates)]
             else:
-                return max(candidates, key=lambda x: x[0])[1]
+                eff = self._kn_wins[candidates] / self._kn_trials[candidates]
+                # argmax zwraca pierwsze maksimum – te same remisy co max() po liście kandydatów
+                return self._kn_engines[candidates[int(np.argmax(eff))]]
         return None
 
+    # --- Meta-wiedza w układzie SoA: wiersz na klucz (engine, n, p, v), osobne tablice kontekstu i win/trials ---
+    @property
+    def knowledge(self):
+        """Widok {(engine, n, p, v): {"win", "trials"}} budowany z tablic (snapshot, odczyt z zewnątrz)."""
+        wins = self._kn_wins.tolist()
+        trials = self._kn_trials.tolist()
+        return {key: {"win": wins[i], "trials": trials[i]} for key, i in self._kn_idx.items()}
+
+    @knowledge.setter
+    def knowledge(self, value):
+        keys = list(value)
+        self._kn_idx = {key: i for i, key in enumerate(keys)}
+        self._kn_engines = [k[0] for k in keys]
+        self._kn_n = np.array([k[1] for k in keys], dtype=np.float64)
+        self._kn_p = np.array([k[2] for k in keys], dtype=np.float64)
+        self._kn_v = np.array([k[3] for k in keys], dtype=np.float64)
+        self._kn_wins = np.array([value[k]["win"] for k in keys], dtype=np.int64)
+        self._kn_trials = np.array([value[k]["trials"] for k in keys], dtype=np.int64)
+
+    def _kn_rows(self, keys):
+        """Indeksy wierszy meta-wiedzy dla kluczy i maska już znanych; nowe klucze dopisywane jednym concatenate (win=trials=0)."""
+        idx = self._kn_idx
+        known = np.array([k in idx for k in keys], dtype=bool)
+        new = [k for k, seen in zip(keys, known) if not seen]
+        if new:
+            start = len(self._kn_engines)
+            for i, k in enumerate(new):
+                idx[k] = start + i
+            self._kn_engines.extend(k[0] for k in new)
+            self._kn_n = np.concatenate((self._kn_n, [k[1] for k in new]))
+            self._kn_p = np.concatenate((self._kn_p, [k[2] for k in new]))
+            self._kn_v = np.concatenate((self._kn_v, [k[3] for k in new]))
+            self._kn_wins = np.concatenate((self._kn_wins, np.zeros(len(new), dtype=np.int64)))
+            self._kn_trials = np.concatenate((self._kn_trials, np.zeros(len(new), dtype=np.int64)))
+        return np.fromiter((idx[k] for k in keys), dtype=np.intp, count=len(keys)), known
+
     def reflect(self, last_n=100):
         """Prosta refleksja: analiza skuteczności i emocji"""
         if len(self.memory) < last_n:
             return None
-        successes = sum(1 for e in self.memory[-last_n:] if e["result"])
+        if self._n_events != len(self.memory):
+            self._rebuild_arrays()  # pamięć zmieniona poza log_event
+        n = self._n_events
+        successes, greed_sum = _reflect_kernel(self._results[:n], self._greed[:n], last_n)
+        successes = int(successes)
         fails = last_n - successes
-        avg_greed = sum(e["emotions"].get("greed", 0) for e in self.memory[-last_n:]) / last_n
+        avg_greed = float(greed_sum) / last_n
         # Automatyczna adaptacja ciekawości/głodu/meta-nagrody
         if successes / last_n < 0.5:
             self.curiosity = min(1.0, self.curiosity + 0.05)
@@ -123,6 +281,22 @@ class MetaReflection:
             "meta_reward": self.meta_reward
         }
 
+    def analyze(self, records):
+        """Podsumowanie okna rekordów silnika ({"action", "result", "profit"}): skuteczność i wynik zamknięć."""
+        n = len(records)
+        if not n:
+            return None
+        ok = np.fromiter((r.get("result") != "fail" for r in records), dtype=bool, count=n)
+        closed = np.fromiter((r.get("action") == "close" for r in records), dtype=bool, count=n)
+        profit = np.fromiter((r.get("profit") or 0 for r in records), dtype=np.float64, count=n)[closed]
+        return {
+            "records": n,
+            "success_rate": float(ok.mean()),
+            "closed": int(profit.size),
+            "total_profit": float(profit.sum()),
+            "avg_profit": float(profit.mean()) if profit.size else 0.0,
+        }
+
     # --- SUPERMETA KOD: SAMOROZWÓJ, KOLONOWANIE, HUNTER-TOOLS, HIVE ---
     def evolve(self, engine_manager, sensor_manager, hunter_tools, hive=None):
         """
@@ -177,17 +351,18 @@ class MetaReflection:
 
     def merge_knowledge(self, remote_knowledge):
         """Inteligentna fuzja meta-wiedzy z innych instancji"""
-        for k, v in remote_knowledge.items():
-            if k in self.knowledge:
-                prev = self.knowledge[k]
-                trials = prev["trials"] + v["trials"]
-                win = prev["win"] + v["win"]
-                self.knowledge[k] = {
-                    "win": int(win * 0.5 + prev["win"] * 0.5),
-                    "trials": int(trials * 0.5 + prev["trials"] * 0.5)
-                }
-            else:
-                self.knowledge[k] = v
+        if remote_knowledge:
+            # Wiersze lokalnej wiedzy dla kluczy zdalnych i ich win/trials wprost z wartości dict
+            rows, known = self._kn_rows(list(remote_knowledge))
+            n = len(rows)
+            values = remote_knowledge.values()
+            r_win = np.fromiter((v["win"] for v in values), dtype=np.int64, count=n)
+            r_trials = np.fromiter((v["trials"] for v in values), dtype=np.int64, count=n)
+            prev_win = self._kn_wins[rows]
+            prev_trials = self._kn_trials[rows]
+            # local.add(remote, fill_value=0) na wyrównanych wierszach, potem mieszanie 50/50 z lokalną wiedzą
+            self._kn_wins[rows] = np.where(known, ((prev_win + r_win) * 0.5 + prev_win * 0.5).astype(int), r_win)
+            self._kn_trials[rows] = np.where(known, ((prev_trials + r_trials) * 0.5 + prev_trials * 0.5).astype(int), r_trials)
         self.save_memory()
 
     # --- DYNAMICZNY SUPERKOD ---
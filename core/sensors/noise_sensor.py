@@ -2,10 +2,9 @@ import numpy as np
 import time
 import copy
 import threading
-import json
 import os
 from datetime import datetime
-from core.base_sensor import BaseSensor
+from core.base_sensor import BaseSensor, PluginSensor, _dumps, _log_handle
 
 class SuperNoiseSensor:
     def __init__(
@@ -51,18 +50,19 @@ class SuperNoiseSensor:
         # Analiza zmian i meta-adaptacja progu
         prices = np.array([b['price'] for b in self.buffer])
         returns = np.diff(prices) if len(prices) > 1 else np.zeros(1)
-        volatility = np.std(returns) if len(returns) > 1 else 0.0
-        max_jump = np.max(np.abs(returns)) if len(returns) > 1 else 0.0
+        volatility = float(returns.std()) if len(returns) > 1 else 0.0
+        max_jump = float(np.abs(returns).max()) if len(returns) > 1 else 0.0
 
         # Meta-tuning – uczy się, jak bardzo rynek jest "szumiący"
         volatility_history = [np.std(np.diff(prices[max(0, i-10):i])) for i in range(10, len(prices))]
-        recent_vol = np.mean(volatility_history) if volatility_history else 0.0
+        recent_vol = float(np.mean(volatility_history)) if volatility_history else 0.0
         self.adaptive_threshold = (self.base_threshold + recent_vol * 2) * (1 + self.learning_rate * self.hunger)
 
         # Detekcja anomalii i wzorców
         anomaly = volatility > self.adaptive_threshold or max_jump > self.adaptive_threshold * 1.5
-        micro_spikes = np.sum(np.abs(returns) > self.adaptive_threshold)
-        micro_lulls = np.sum(np.abs(returns) < self.adaptive_threshold * 0.12)
+        abs_returns = np.abs(returns)
+        micro_spikes = int(np.count_nonzero(abs_returns > self.adaptive_threshold))
+        micro_lulls = int(np.count_nonzero(abs_returns < self.adaptive_threshold * 0.12))
         pressure = volume * spread * (1 + volatility)
         
         # Samouczenie przez "głód" (hunger)
@@ -118,9 +118,7 @@ class SuperNoiseSensor:
 
     def _auto_log(self, result):
         """Zapisuje bieżący wynik do pliku log."""
-        os.makedirs(os.path.dirname(self.auto_log_path), exist_ok=True)
-        with open(self.auto_log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        _log_handle(self.auto_log_path).write(_dumps(result))
 
     def clone(self):
         """Klonuje sensor w nowym kontekście."""
@@ -160,7 +158,9 @@ if __name__ == "__main__":
             break
 import numpy as np
 
-class NoiseSensor:
+class NoiseSensor(PluginSensor):
+    field = "noise"
+
     def activate(self):
         print("[NoiseSensor] Sensor szumu aktywowany")
     def mutate(self):
@@ -168,4 +168,3 @@ class NoiseSensor:
     def evaluate(self, test_data):
         import numpy as np
         return np.mean(test_data)  # Przykład: średni poziom szumu
-
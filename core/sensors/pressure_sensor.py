@@ -2,10 +2,9 @@ import numpy as np
 import time
 import copy
 import threading
-import json
 import os
 from datetime import datetime
-from core.base_sensor import BaseSensor
+from core.base_sensor import BaseSensor, PluginSensor, _dumps, _log_handle
 
 class SuperPressureSensor:
     def __init__(
@@ -52,20 +51,20 @@ class SuperPressureSensor:
 
         # Statystyki
         pressures = np.array([b['pressure'] for b in self.buffer])
-        mean_pressure = np.mean(pressures)
-        std_pressure = np.std(pressures)
-        max_pressure = np.max(pressures)
-        min_pressure = np.min(pressures)
+        mean_pressure = float(pressures.mean())
+        std_pressure = float(pressures.std())
+        max_pressure = float(pressures.max())
+        min_pressure = float(pressures.min())
         range_pressure = max_pressure - min_pressure
 
         # Adaptacyjny próg, samouczenie
-        recent_vol = np.std(pressures[-min(10, len(pressures)):]) if len(pressures) > 10 else std_pressure
+        recent_vol = float(np.std(pressures[-min(10, len(pressures)):])) if len(pressures) > 10 else std_pressure
         self.adaptive_pressure = self.base_pressure + self.learning_rate * (recent_vol + self.hunger)
 
         # Detekcja anomalii
         anomaly = pressure > (self.adaptive_pressure * 2) or pressure < (self.adaptive_pressure * 0.5)
-        micro_spikes = np.sum(np.abs(pressures - mean_pressure) > self.adaptive_pressure)
-        pressure_trend = np.polyfit(np.arange(len(pressures)), pressures, 1)[0] if len(pressures) > 5 else 0.0
+        micro_spikes = int(np.count_nonzero(np.abs(pressures - mean_pressure) > self.adaptive_pressure))
+        pressure_trend = float(np.polyfit(np.arange(len(pressures)), pressures, 1)[0]) if len(pressures) > 5 else 0.0
 
         # Samouczenie, "głód"
         if anomaly:
@@ -116,9 +115,7 @@ class SuperPressureSensor:
         }
 
     def _auto_log(self, result):
-        os.makedirs(os.path.dirname(self.auto_log_path), exist_ok=True)
-        with open(self.auto_log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        _log_handle(self.auto_log_path).write(_dumps(result))
 
     def clone(self):
         self.clone_count += 1
@@ -154,7 +151,9 @@ if __name__ == "__main__":
             break
 import numpy as np
 
-class PressureSensor:
+class PressureSensor(PluginSensor):
+    field = "pressure"
+
     def activate(self):
         print("[PressureSensor] Sensor ciśnienia aktywowany")
 
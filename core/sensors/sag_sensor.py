@@ -12,8 +12,8 @@ class SuperAggressiveSensor(BaseSensor):
     Kompatybilny z wszystkimi silnikami gie.
     """
 
-    def __init__(self, window: int = 100, hunger: float = 1.0, cooldown_period: float = 4.0):
-        super().__init__()
+    def __init__(self, window: int = 100, hunger: float = 1.0, cooldown_period: float = 4.0, **kwargs):
+        super().__init__(window=window, **kwargs)
         self.window = window
         self.hunger = hunger
         self.cooldown_period = cooldown_period
@@ -2,10 +2,9 @@ import numpy as np
 import time
 import copy
 import threading
-import json
 import os
 from datetime import datetime
-from core.base_sensor import BaseSensor
+from core.base_sensor import BaseSensor, PluginSensor, _dumps, _log_handle
 
 class SuperVolumeSensor:
     def __init__(
@@ -47,18 +46,18 @@ class SuperVolumeSensor:
             self.buffer.pop(0)
 
         volumes = np.array([b['volume'] for b in self.buffer])
-        mean_volume = np.mean(volumes)
-        std_volume = np.std(volumes)
-        max_volume = np.max(volumes)
-        min_volume = np.min(volumes)
+        mean_volume = float(volumes.mean())
+        std_volume = float(volumes.std())
+        max_volume = float(volumes.max())
+        min_volume = float(volumes.min())
         range_volume = max_volume - min_volume
 
-        recent_vol = np.std(volumes[-min(10, len(volumes)):]) if len(volumes) > 10 else std_volume
+        recent_vol = float(np.std(volumes[-min(10, len(volumes)):])) if len(volumes) > 10 else std_volume
         self.adaptive_volume = self.base_volume + self.learning_rate * (recent_vol + self.hunger)
 
         anomaly = volume > (self.adaptive_volume * 2) or volume < (self.adaptive_volume * 0.5)
-        micro_spikes = np.sum(np.abs(volumes - mean_volume) > self.adaptive_volume)
-        volume_trend = np.polyfit(np.arange(len(volumes)), volumes, 1)[0] if len(volumes) > 5 else 0.0
+        micro_spikes = int(np.count_nonzero(np.abs(volumes - mean_volume) > self.adaptive_volume))
+        volume_trend = float(np.polyfit(np.arange(len(volumes)), volumes, 1)[0]) if len(volumes) > 5 else 0.0
 
         if anomaly:
             self.hunger = max(0, self.hunger - 1)
@@ -105,9 +104,7 @@ class SuperVolumeSensor:
         }
 
     def _auto_log(self, result):
-        os.makedirs(os.path.dirname(self.auto_log_path), exist_ok=True)
-        with open(self.auto_log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        _log_handle(self.auto_log_path).write(_dumps(result))
 
     def clone(self):
         self.clone_count += 1
@@ -142,7 +139,9 @@ if __name__ == "__main__":
             break
 import numpy as np
 
-class VolumeSensor:
+class VolumeSensor(PluginSensor):
+    field = "volume"
+
     def activate(self):
         print("[VolumeSensor] Sensor wolumenu aktywowany")
 
@@ -0,0 +1,133 @@
+# utils/async_log_writer.py – asynchroniczny, buforowany zapis logów GIE
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+import weakref
+
+# Otwarte writery – przy wyjściu z procesu dopisujemy ich zaległe linie.
+# Obsługa sygnałów (SIGTERM) należy do punktów wejścia, np. gie_start.
+_WRITERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_writers():
+    for writer in list(_WRITERS):
+        writer.close()
+
+
+class AsyncLogWriter:
+    """
+    Producent wrzuca gotową linię do kolejki i od razu wraca; wątek tła zbiera paczkę
+    (maks. max_batch linii lub max_delay sekund) i zapisuje ją przez bufor 64 KB.
+    Przy pełnej kolejce wypada najstarsza linia – log nigdy nie blokuje pętli GIE.
+    """
+
+    def __init__(self, path, max_batch=512, max_delay=1.0, maxsize=20000, buffer_size=1 << 16):
+        self.path = path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.dropped = 0
+        self.write_errors = 0
+        self._reported_dropped = 0
+        self._closed = False
+        self._q = queue.Queue(maxsize=maxsize)
+        self._fh = open(path, "ab", buffering=buffer_size)
+        threading.Thread(target=self._writer_loop, name=f"log-writer:{path}", daemon=True).start()
+        _WRITERS.add(self)
+
+    def write(self, line):
+        if self._closed:
+            return
+        try:
+            self._q.put_nowait(line)
+        except queue.Full:
+            try:
+                self._q.get_nowait()
+                self._q.task_done()
+            except queue.Empty:
+                pass
+            self.dropped += 1
+            try:
+                self._q.put_nowait(line)
+            except queue.Full:
+                self.dropped += 1
+
+    def _writer_loop(self):
+        q = self._q
+        while True:
+            # Paczka: pierwsza linia + wszystko, co dojdzie w max_delay (maks. max_batch); None = koniec
+            item = q.get()
+            stop = item is None
+            batch = [] if stop else [item]
+            deadline = time.monotonic() + self.max_delay
+            while not stop and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            notice = ""
+            try:
+                if self.dropped != self._reported_dropped:
+                    # Utracone linie (pełna kolejka) odnotowane w samym logu i na stderr
+                    lost = self.dropped - self._reported_dropped
+                    self._reported_dropped = self.dropped
+                    notice = f"[AsyncLogWriter] pominięto {lost} linii logu (pełna kolejka, łącznie {self.dropped})\n"
+                    sys.stderr.write(notice)
+                if batch or notice:
+                    self._fh.write((notice + "".join(batch)).encode("utf-8"))
+                if stop:
+                    self._fh.close()
+                else:
+                    self._fh.flush()
+            except Exception as e:
+                self.write_errors += 1
+                sys.stderr.write(f"[AsyncLogWriter] błąd zapisu {self.path}: {e} ({len(batch)} linii utraconych)\n")
+            finally:
+                for _ in range(len(batch) + stop):
+                    q.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        """Czeka, aż wątek tła zapisze wszystko, co już trafiło do kolejki."""
+        self._q.join()
+
+    def close(self):
+        """Dopisuje zaległe linie, zamyka plik i kończy wątek tła."""
+        if self._closed:
+            return
+        self._closed = True
+        self._q.put(None)
+        self._q.join()
+        _WRITERS.discard(self)
+
+
+class AsyncFileHandler(logging.Handler):
+    """Handler logging: formatuje rekord w wątku wołającym, zapis oddaje do AsyncLogWriter."""
+
+    def __init__(self, path, **writer_kwargs):
+        super().__init__()
+        self.writer = AsyncLogWriter(path, **writer_kwargs)
+
+    def emit(self, record):
+        try:
+            self.writer.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+        super().close()
@@ -0,0 +1,28 @@
+# utils/lazy_import.py – leniwe importy ciężkich zależności (numpy, pandas, ...)
+import importlib
+
+class LazyModule:
+    """
+    Pośrednik modułu: prawdziwy import następuje dopiero przy pierwszym
+    dostępie do atrybutu, dzięki czemu import pakietu GIE pozostaje tani.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+def lazy_import(name):
+    """np = lazy_import("numpy") – moduł ładowany przy pierwszym użyciu."""
+    return LazyModule(name)
@@ -4,6 +4,8 @@ import logging
 import os
 from datetime import datetime
 
+from utils.async_log_writer import AsyncFileHandler
+
 class Logger:
     """
     Podstawowy logger GIE – szybki, czytelny, uniwersalny.
@@ -15,10 +17,10 @@ class Logger:
         log_path = os.path.join(log_dir, log_name)
         self.logger = logging.getLogger("GIE_Logger")
         self.logger.setLevel(level)
-        fh = logging.FileHandler(log_path)
-        formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
-        fh.setFormatter(formatter)
         if not self.logger.hasHandlers():
+            # Zapis w wątku tła – log() tylko wrzuca linię do kolejki
+            fh = AsyncFileHandler(log_path)
+            fh.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
             self.logger.addHandler(fh)
 
     def log(self, message, level=logging.INFO):
@@ -5,6 +5,8 @@ import json
 import logging
 from datetime import datetime, timedelta
 
+from utils.async_log_writer import AsyncFileHandler
+
 
 class MetaLogger:
     """
@@ -24,13 +26,18 @@ class MetaLogger:
         self.logger.setLevel(logging.DEBUG)
         formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
 
-        fh = logging.FileHandler(self.log_path, encoding="utf-8")
-        fh.setFormatter(formatter)
-
         if not self.logger.handlers:
+            # Zapis w wątku tła – debug/info/... tylko wrzucają linię do kolejki
+            fh = AsyncFileHandler(self.log_path)
+            fh.setFormatter(formatter)
             self.logger.addHandler(fh)
 
     # INTERFEJS DO LOGOWANIA
+    @property
+    def debug_enabled(self):
+        """Czy wpisy DEBUG w ogóle trafią do logu – pozwala pominąć budowanie kosztownych komunikatów."""
+        return self.logger.isEnabledFor(logging.DEBUG)
+
     def debug(self, message: str):
         self.logger.debug(message)
 
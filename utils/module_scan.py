@@ -0,0 +1,30 @@
+# utils/module_scan.py – szybkie skanowanie folderów z modułami (engines, sensors, plugins)
+import os
+
+# {(folder, skip_prefix): (mtime_ns, nazwy_modułów)}
+_SCAN_CACHE = {}
+
+def scan_py_modules(folder, skip_prefix="_"):
+    """
+    Zwraca krotkę nazw modułów .py z folderu (bez rozszerzenia).
+    Wynik jest cache'owany i odświeżany tylko po zmianie mtime katalogu,
+    więc kolejne wywołania to jeden os.stat zamiast pełnego listowania.
+    """
+    try:
+        mtime = os.stat(folder).st_mtime_ns
+    except OSError:
+        return ()
+    key = (os.path.abspath(folder), skip_prefix)
+    cached = _SCAN_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    names = []
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            name = entry.name
+            # is_file() z DirEntry zwykle bez dodatkowego stat (typ wpisu z readdir)
+            if name.endswith(".py") and not name.startswith(skip_prefix) and entry.is_file():
+                names.append(name[:-3])
+    names = tuple(names)
+    _SCAN_CACHE[key] = (mtime, names)
+    return names